@@ -0,0 +1,147 @@
+import os
+import sys
+import json
+import time
+import random
+import pygame
+from constants import *
+
+def user_cache_dir(app="space-run"):
+    """Per-user cache directory following each platform's convention"""
+    if os.environ.get("SPACE_RUN_CACHE_DIR"):
+        return os.environ["SPACE_RUN_CACHE_DIR"]
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, app, "assets")
+
+# Baked surfaces stored as PNGs; a JSON manifest per key lists the files and is written last
+class BakedAssetCache:
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, name, version, seed):
+        # Everything the generators depend on: the resolution and the configurable sizes
+        # they are drawn at (add any other setting a bake function starts reading)
+        return f"{name}-{WIDTH}x{HEIGHT}-g{GROUND_HEIGHT}-p{PLAYER_SIZE}-v{version}-s{seed}"
+
+    def load(self, key):
+        """Surfaces stored under key, or None when missing or unreadable"""
+        try:
+            with open(os.path.join(self.directory, key + ".json")) as f:
+                files = json.load(f)["files"]
+            surfaces = [pygame.image.load(os.path.join(self.directory, name)) for name in files]
+        except (OSError, ValueError, KeyError, pygame.error):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return surfaces
+
+    def save(self, key, surfaces):
+        """Store surfaces under key; a failed write only means regenerating next time"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            files = []
+            for i, surface in enumerate(surfaces):
+                name = f"{key}-{i}.png"
+                # Write beside the target and rename, so readers never see half a file
+                temp = os.path.join(self.directory, "." + name)
+                pygame.image.save(surface, temp)
+                os.replace(temp, os.path.join(self.directory, name))
+                files.append(name)
+            temp = os.path.join(self.directory, "." + key + ".json")
+            with open(temp, "w") as f:
+                json.dump({"files": files}, f)
+            os.replace(temp, os.path.join(self.directory, key + ".json"))
+        except (OSError, pygame.error):
+            pass
+
+    def clear(self):
+        """Delete every cached file"""
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith((".png", ".json")):
+                os.remove(os.path.join(self.directory, name))
+
+# Procedural assets are registered by name and only generated the first time they're used
+class AssetRegistry:
+    def __init__(self, cache=None, seed=0):
+        self.cache = cache
+        self.seed = seed
+        self._factories = {}
+        self._assets = {}
+        self.build_times = {}  # name -> seconds spent generating or loading, for startup profiling
+
+    def register(self, name, factory, bake=None, version=1):
+        """Register a factory; registering again replaces it and drops the old asset
+
+        Without bake, factory() builds the asset. With bake, bake() draws the raw
+        surfaces (a Surface or a list of them) under a fixed seed, they go through the
+        disk cache, and factory(*surfaces) turns them into the asset. Bump version
+        whenever the bake function's output changes.
+        """
+        self._factories[name] = (factory, bake, version)
+        self._assets.pop(name, None)
+
+    def get(self, name):
+        """Return the asset, generating it on first use"""
+        try:
+            return self._assets[name]
+        except KeyError:
+            pass
+        start = time.perf_counter()
+        factory, bake, version = self._factories[name]
+        if bake is None:
+            asset = factory()
+        else:
+            asset = factory(*self._baked_surfaces(name, bake, version))
+        self.build_times[name] = time.perf_counter() - start
+        self._assets[name] = asset
+        return asset
+
+    __getitem__ = get
+
+    def _baked_surfaces(self, name, bake, version):
+        key = self.cache.key(name, version, self.seed) if self.cache else None
+        surfaces = self.cache.load(key) if key else None
+        if surfaces is not None:
+            return surfaces
+
+        # Seed the generators so an asset looks the same whether it was cached or not
+        state = random.getstate()
+        random.seed(f"{self.seed}:{name}")
+        try:
+            surfaces = bake()
+        finally:
+            random.setstate(state)
+        if isinstance(surfaces, pygame.Surface):
+            surfaces = [surfaces]
+        if key:
+            self.cache.save(key, surfaces)
+        return surfaces
+
+    def preload(self, names=None):
+        """Generate assets ahead of time, e.g. behind a loading screen"""
+        for name in names or list(self._factories):
+            self.get(name)
+
+    def loaded(self, name):
+        return name in self._assets
+
+    def unload(self, name=None):
+        """Drop one generated asset, or all of them, so they are rebuilt on next use"""
+        if name is None:
+            self._assets.clear()
+        else:
+            self._assets.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self._factories
+
+assets = AssetRegistry(BakedAssetCache(user_cache_dir()) if ASSET_CACHE else None, ASSET_SEED)
@@ -0,0 +1,6 @@
+"""
+Rendering microbenchmarks for Space Run
+
+Run with: python -m benchmarks [--resolutions 800x400 1920x1080] [--output results.json]
+                               [--baseline baseline.json]
+"""
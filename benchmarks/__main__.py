@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+
+DEFAULT_RESOLUTIONS = ["800x400", "1920x1080", "3840x2160"]
+REGRESSION_THRESHOLD = 0.10  # Flag components whose mean time grew by more than 10%
+
+def run_resolution(resolution, names):
+    """Run the component benchmarks in a fresh process at one resolution"""
+    env = dict(os.environ, SPACE_RUN_RESOLUTION=resolution,
+               SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    output = subprocess.run([sys.executable, "-m", "benchmarks.components", *names],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    # pygame prints a banner before our JSON line
+    return json.loads(output.strip().splitlines()[-1])["results"]
+
+def compare(results, baseline):
+    """Print mean-time changes against a saved baseline; returns the number of regressions"""
+    regressions = 0
+    for resolution, components in results.items():
+        for name, stats in components.items():
+            old = baseline.get("results", {}).get(resolution, {}).get(name)
+            if not old:
+                continue
+            change = stats["mean_us"] / old["mean_us"] - 1 if old["mean_us"] else 0
+            flag = "  REGRESSION" if change > REGRESSION_THRESHOLD else ""
+            if flag:
+                regressions += 1
+            print(f"{resolution:>10} {name:<22} {old['mean_us']:>10.1f} -> {stats['mean_us']:>10.1f} us"
+                  f" ({change:+.0%}){flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Space Run rendering microbenchmarks")
+    parser.add_argument("--resolutions", nargs="+", default=DEFAULT_RESOLUTIONS)
+    parser.add_argument("--only", nargs="+", default=[], help="Benchmark names to run")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    args = parser.parse_args()
+
+    results = {}
+    for resolution in args.resolutions:
+        print(f"Running {resolution}...", file=sys.stderr)
+        results[resolution] = run_resolution(resolution, args.only)
+        for name, stats in results[resolution].items():
+            print(f"{resolution:>10} {name:<22} mean {stats['mean_us']:>9.1f} us"
+                  f"  p50 {stats['p50_us']:>9.1f}  p99 {stats['p99_us']:>9.1f}"
+                  f"  surfaces {stats['surfaces']:>5.1f} ({stats['surface_bytes'] / 1024:>7.1f} KiB)"
+                  f"  py heap {stats['py_heap_peak_bytes']:>8.0f} B")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
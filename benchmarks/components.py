@@ -0,0 +1,231 @@
+"""
+Per-component rendering benchmarks at a single resolution
+
+The resolution is fixed when constants is imported, so this module is run once
+per resolution in its own process (see benchmarks/__main__.py):
+
+    SPACE_RUN_RESOLUTION=1920x1080 python -m benchmarks.components
+"""
+import os
+import sys
+import json
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from constants import *
+from obstacles import Obstacle, Spike
+from player import Player
+from particles import ParticlePool, get_particle_atlas
+from visuals import draw_parallax_background, draw_ground
+from utils import draw_neon_text
+from text_render import draw_cached_neon_text, NeonCounter
+from main import Notification
+
+WARMUP_CALLS = 20
+TIMED_CALLS = 300
+ALLOC_CALLS = 50
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class SurfaceCounter:
+    """Counts the SDL surfaces created while active, and the bytes of their pixels
+
+    tracemalloc only sees the Python heap, not the pixel buffers SDL allocates.
+    pygame.Surface() and the pygame.transform functions are swapped for
+    counting versions while active. Font.render(), copy() and convert() are
+    methods of immutable C types, so surfaces they create aren't seen.
+    """
+    TRANSFORMS = ("scale", "smoothscale", "scale_by", "smoothscale_by", "rotate", "rotozoom", "flip")
+
+    def __init__(self):
+        self.count = 0
+        self.bytes = 0
+        self._saved = []
+
+    def _add(self, surface):
+        self.count += 1
+        self.bytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def _counted(self, func):
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            # scale() into a dest_surface returns that surface rather than a new one
+            if not any(result is arg for arg in (*args, *kwargs.values())):
+                self._add(result)
+            return result
+        return wrapper
+
+    def __enter__(self):
+        counter = self
+        class CountedSurface(pygame.Surface):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                counter._add(self)
+        self._saved = [(pygame, "Surface", pygame.Surface)]
+        pygame.Surface = CountedSurface
+        for name in self.TRANSFORMS:
+            func = getattr(pygame.transform, name, None)
+            if func is not None:
+                self._saved.append((pygame.transform, name, func))
+                setattr(pygame.transform, name, self._counted(func))
+        return self
+
+    def __exit__(self, *exc):
+        for module, name, value in self._saved:
+            setattr(module, name, value)
+        self._saved = []
+
+def measure(func, calls=TIMED_CALLS):
+    """Time func() per call, then sample its Python-heap and SDL surface allocations"""
+    for _ in range(WARMUP_CALLS):
+        func()
+
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter_ns()
+        func()
+        timings.append(time.perf_counter_ns() - start)
+    timings.sort()
+
+    # Allocation sampling runs separately so tracing doesn't skew the timings
+    tracemalloc.start()
+    peaks = []
+    blocks = 0
+    for _ in range(ALLOC_CALLS):
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        func()
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        after = tracemalloc.take_snapshot()
+        blocks += sum(max(0, stat.count_diff) for stat in after.compare_to(before, "lineno"))
+    tracemalloc.stop()
+
+    with SurfaceCounter() as surfaces:
+        for _ in range(ALLOC_CALLS):
+            func()
+
+    return {
+        "calls": calls,
+        "mean_us": sum(timings) / len(timings) / 1000,
+        "p50_us": _percentile(timings, 0.50) / 1000,
+        "p99_us": _percentile(timings, 0.99) / 1000,
+        "py_heap_peak_bytes": sum(peaks) / len(peaks),  # Python objects only, see SurfaceCounter
+        "py_heap_blocks": blocks / ALLOC_CALLS,
+        "surfaces": surfaces.count / ALLOC_CALLS,
+        "surface_bytes": surfaces.bytes / ALLOC_CALLS,
+    }
+
+# Each benchmark builds its fixture and returns the callable to time
+def bench_obstacle_draw(surface):
+    obstacles = [Obstacle(WIDTH * i // 5) for i in range(5)]
+    def run():
+        for obstacle in obstacles:
+            obstacle.update(0)
+            obstacle.draw(surface)
+    return run
+
+def bench_spike_draw(surface):
+    spikes = []
+    for i in range(5):
+        height = SPIKE_HEIGHT
+        spikes.append(Spike(WIDTH * i // 5, HEIGHT - GROUND_HEIGHT - height, SPIKE_WIDTH * 2, height))
+    def run():
+        for spike in spikes:
+            spike.draw(surface)
+    return run
+
+def bench_particle_draw(surface):
+    get_particle_atlas()
+    pool = ParticlePool(512, seed=0)
+    for kind in ("explode", "trail", "land", "shield", "score", "normal"):
+        pool.emit(WIDTH // 2, HEIGHT // 2, kind, 40, spread=(WIDTH // 4, HEIGHT // 4))
+    def run():
+        pool.draw(surface)
+    return run
+
+def bench_player_draw(surface):
+    player = Player()
+    player.dash_effect_timer = 10
+    def run():
+        player.rotation = (player.rotation + 6) % 360
+        player.draw(surface)
+    return run
+
+def bench_parallax_background(surface):
+    offset = [0]
+    def run():
+        offset[0] += 3
+        draw_parallax_background(offset[0], surface)
+    return run
+
+def bench_ground(surface):
+    offset = [0]
+    def run():
+        offset[0] += 6
+        draw_ground(offset[0], surface)
+    return run
+
+def bench_neon_text(surface):
+    font = pygame.font.SysFont('Arial', 36, bold=True)
+    def run():
+        draw_neon_text(surface, "Score: 1234", font, (255, 255, 255), (20, 20), (150, 150, 150), 3)
+    return run
+
+def bench_cached_neon_text(surface):
+    font = pygame.font.SysFont('Arial', 36, bold=True)
+    def run():
+        draw_cached_neon_text(surface, "Score: 1234", font, (255, 255, 255), (20, 20), (150, 150, 150), 3)
+    return run
+
+def bench_neon_counter(surface):
+    font = pygame.font.SysFont('Arial', 36, bold=True)
+    counter = NeonCounter("Score: ", font, (255, 255, 255), (150, 150, 150), 3)
+    score = [0]
+    def run():
+        # The score changes a few times a second in play
+        score[0] += 1
+        counter.draw(surface, score[0] // 20, (20, 20))
+    return run
+
+def bench_notification_draw(surface):
+    notification = Notification("Shield Activated!", (50, 100, 255), size="medium")
+    def run():
+        notification.remaining = max(1, notification.remaining - 1)
+        notification.draw(surface, WIDTH // 2, HEIGHT // 4)
+    return run
+
+BENCHMARKS = {
+    "obstacle_draw": bench_obstacle_draw,
+    "spike_draw": bench_spike_draw,
+    "particle_draw": bench_particle_draw,
+    "player_draw": bench_player_draw,
+    "parallax_background": bench_parallax_background,
+    "ground": bench_ground,
+    "neon_text": bench_neon_text,
+    "cached_neon_text": bench_cached_neon_text,
+    "neon_counter": bench_neon_counter,
+    "notification_draw": bench_notification_draw,
+}
+
+def run_all(names=None):
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+    results = {}
+    for name, factory in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        results[name] = measure(factory(surface))
+    return results
+
+if __name__ == "__main__":
+    names = sys.argv[1:]
+    print(json.dumps({"resolution": f"{WIDTH}x{HEIGHT}", "results": run_all(names)}))
@@ -0,0 +1,62 @@
+import numpy as np
+import pygame
+from cache import LRUCache
+
+# Vectorized bloom/glow rendering with an LRU cache of finished glows
+def _box_blur(values, radius):
+    """Blur a 2D array along its first axis with a running-sum box filter"""
+    window = radius * 2 + 1
+    padded = np.pad(values, ((radius + 1, radius), (0, 0)))
+    summed = np.cumsum(padded, axis=0)
+    return (summed[window:] - summed[:-window]) / window
+
+def build_bloom(surface, radius=10, color=(255, 255, 255), alpha_factor=0.5):
+    """Build a tinted, blurred glow for a surface using array operations"""
+    # Same footprint as the original per-pixel bloom: padded by radius on each side
+    width, height = surface.get_width() + radius * 2, surface.get_height() + radius * 2
+    scaled = pygame.transform.scale(surface, (surface.get_width() + radius, surface.get_height() + radius))
+
+    # Place the scaled silhouette's alpha into the padded canvas
+    alpha = np.zeros((width, height), np.float32)
+    offset = radius // 2
+    alpha[offset:offset + scaled.get_width(), offset:offset + scaled.get_height()] = \
+        pygame.surfarray.array_alpha(scaled)
+
+    # Separable blur: one pass per axis
+    blur_radius = radius // 2
+    if blur_radius > 0:
+        alpha = _box_blur(alpha, blur_radius)
+        alpha = _box_blur(alpha.T, blur_radius).T
+    alpha *= alpha_factor
+
+    # Tint the glow by its own opacity, as the per-pixel version did
+    bloom = pygame.Surface((width, height), pygame.SRCALPHA)
+    tint = np.array(color[:3], np.float32) / 255.0
+    rgb = pygame.surfarray.pixels3d(bloom)
+    rgb[...] = np.minimum(255, alpha[..., None] * tint).astype(np.uint8)
+    del rgb  # Release the surface lock
+    bloom_alpha = pygame.surfarray.pixels_alpha(bloom)
+    bloom_alpha[...] = np.minimum(255, alpha).astype(np.uint8)
+    del bloom_alpha
+
+    return bloom
+
+class BloomEngine:
+    def __init__(self, maxsize=64):
+        self.cache = LRUCache(maxsize)
+
+    def bloom(self, surface, radius=10, color=(255, 255, 255), alpha_factor=0.5, key=None):
+        """Return a cached glow for the surface, building it on a miss
+
+        Without a key the surface itself is used; the cache holds a reference to it,
+        so its identity cannot be reused while the entry is alive.
+        """
+        if key is None:
+            key = surface
+        cache_key = (key, radius, tuple(color), alpha_factor)
+        bloom = self.cache.get(cache_key)
+        if bloom is None:
+            bloom = self.cache.put(cache_key, build_bloom(surface, radius, color, alpha_factor))
+        return bloom
+
+bloom_engine = BloomEngine()
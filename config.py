@@ -0,0 +1,243 @@
+"""
+Runtime configuration
+
+Settings are layered: the defaults below, then a config file (JSON, or TOML
+where tomllib is available), then SPACE_RUN_* environment variables, then
+command-line flags. Sizes and speeds are in the 800x400 design units the
+game was tuned at; GameConfig.metrics scales them to the logical resolution.
+
+    python run.py --game-speed 6 --no-enable-bloom
+    SPACE_RUN_SPIKE_CHANCE=0.5 python run.py
+    python run.py --config space_run.toml
+
+constants.py is built from default_config(), so modules that still read the
+constants see the same values. Objects that take a config (GameSimulation,
+Player, Obstacle, Spike, PowerUp and the visuals' draw functions) can be
+given different ones in the same process, e.g. to sweep gameplay settings
+in a benchmark. Baked images are process-wide, so a config drawn on screen
+must use the process resolution.
+"""
+import os
+import sys
+import json
+import argparse
+from functools import cached_property
+from collections import namedtuple
+from dataclasses import dataclass, fields, replace
+from typing import Optional
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+ORIGINAL_WIDTH, ORIGINAL_HEIGHT = 800, 400
+ENV_PREFIX = "SPACE_RUN_"
+CONFIG_FILES = ("space_run.toml", "space_run.json")  # Looked for in the working directory
+
+# Settings the simulation reads besides the resolution and rate; replays store them
+GAMEPLAY_FIELDS = (
+    "gravity", "jump_strength", "game_speed", "ground_height", "player_size",
+    "obstacle_width_min", "obstacle_width_max", "obstacle_min_height", "obstacle_max_height",
+    "min_obstacle_distance", "max_obstacle_distance", "spike_width", "spike_height",
+    "spike_chance", "power_up_chance", "level_chunk_size", "particle_frequency",
+)
+
+# Pixel values for one config at its logical resolution
+Metrics = namedtuple("Metrics", [
+    "width", "height", "display_width", "display_height", "scale_x", "scale_y",
+    "gravity", "jump_strength", "game_speed", "ground_height", "player_size",
+    "obstacle_width_min", "obstacle_width_max", "obstacle_min_height", "obstacle_max_height",
+    "min_obstacle_distance", "max_obstacle_distance", "spike_width", "spike_height",
+])
+
+@dataclass(frozen=True)
+class GameConfig:
+    # Rendering: 0 x 0 derives the logical resolution from the desktop
+    width: int = 0
+    height: int = 0
+    max_render_height: int = 1080  # Larger displays render at an integer fraction of their size; 0 for native
+    render_scale: int = 0  # Integer upscale factor; 0 picks the smallest one within max_render_height
+    render_smooth: bool = False  # Filter the software upscale (smoothscale)
+    vsync: bool = True
+    max_fps: int = 0  # Render frame cap, 0 for uncapped
+    menu_fps: int = 30
+
+    # Frame timing
+    simulation_rate: int = 60  # Steps per second; per-step speeds are tuned for 60
+    max_steps_per_frame: int = 5  # Catch-up limit after a long stall
+
+    # Gameplay, in design units
+    gravity: float = 1.0
+    jump_strength: float = 18.0
+    game_speed: float = 5.0
+    ground_height: int = 50
+    player_size: int = 40
+    obstacle_width_min: int = 60
+    obstacle_width_max: int = 120
+    obstacle_min_height: int = 50
+    obstacle_max_height: int = 120
+    min_obstacle_distance: int = 150
+    max_obstacle_distance: int = 300
+    spike_width: int = 30
+    spike_height: int = 30
+    spike_chance: float = 0.3  # Chance of a spike instead of a platform
+    power_up_chance: float = 0.35  # Chance of a power-up in the gap after each obstacle/spike
+
+    # Level generation
+    level_seed: Optional[int] = None  # None picks a random seed
+    level_chunk_size: int = 8
+
+    # Effects
+    enable_bloom: bool = True
+    enable_parallax: bool = True
+    particle_frequency: float = 0.005  # Chance per step of an ambient particle
+    adaptive_quality: bool = True
+
+    # Generated backgrounds and sprites
+    asset_cache: bool = True
+    asset_seed: int = 0
+
+    # Logging
+    log_level: str = "INFO"  # DEBUG, INFO, WARNING or ERROR
+
+    @cached_property
+    def metrics(self):
+        """Sizes and speeds in pixels; the desktop is queried once if the resolution is automatic"""
+        if self.width and self.height:
+            width, height = self.width, self.height
+            display_width, display_height = width, height
+        else:
+            display_width, display_height = desktop_size()
+            # An integer factor keeps the GPU upscale sharp and lets SCALED fill the screen exactly
+            upscale = self.render_scale
+            if not upscale:
+                upscale = max(1, -(-display_height // self.max_render_height)) if self.max_render_height else 1
+            width, height = display_width // upscale, display_height // upscale
+        sx, sy = width / ORIGINAL_WIDTH, height / ORIGINAL_HEIGHT
+        return Metrics(
+            width, height, display_width, display_height, sx, sy,
+            gravity=self.gravity * sy,
+            jump_strength=self.jump_strength * sy,
+            game_speed=self.game_speed * sx,
+            ground_height=int(self.ground_height * sy),
+            player_size=int(self.player_size * sx),
+            obstacle_width_min=int(self.obstacle_width_min * sx),
+            obstacle_width_max=int(self.obstacle_width_max * sx),
+            obstacle_min_height=int(self.obstacle_min_height * sy),
+            obstacle_max_height=int(self.obstacle_max_height * sy),
+            min_obstacle_distance=int(self.min_obstacle_distance * sx),
+            max_obstacle_distance=int(self.max_obstacle_distance * sx),
+            spike_width=int(self.spike_width * sx),
+            spike_height=int(self.spike_height * sy),
+        )
+
+    def with_overrides(self, **settings):
+        """A copy with some settings changed (values are converted like env/CLI strings)"""
+        types = _field_types()
+        for name, value in settings.items():
+            if name not in types:
+                raise ValueError(f"unknown setting {name!r}")
+            if isinstance(value, str):
+                settings[name] = parse_value(types[name], value)
+        return replace(self, **settings)
+
+def desktop_size():
+    """Size of the desktop; only the display subsystem starts and no window is opened"""
+    import pygame
+    pygame.display.init()
+    info = pygame.display.Info()
+    return info.current_w, info.current_h
+
+def _field_types():
+    return {field.name: field.type for field in fields(GameConfig)}
+
+def parse_value(kind, text):
+    """Convert an env/CLI string to a field's type"""
+    text = text.strip()
+    if kind == Optional[int]:
+        return None if text.lower() in ("", "none", "random") else int(text)
+    if kind is bool:
+        if text.lower() in ("1", "true", "yes", "on"):
+            return True
+        if text.lower() in ("0", "false", "no", "off"):
+            return False
+        raise ValueError(f"expected a boolean, got {text!r}")
+    return kind(text)
+
+def read_config_file(path):
+    """Settings from a JSON or TOML file, as a dict"""
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError(f"{path}: TOML config files need Python 3.11+; use JSON instead")
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path) as f:
+        return json.load(f)
+
+def env_settings(env):
+    """Settings from SPACE_RUN_<NAME> variables, plus the older RESOLUTION and SEED ones"""
+    settings = {}
+    if env.get(ENV_PREFIX + "RESOLUTION"):
+        settings["width"], settings["height"] = env[ENV_PREFIX + "RESOLUTION"].lower().split("x")
+    if env.get(ENV_PREFIX + "SEED"):
+        settings["level_seed"] = env[ENV_PREFIX + "SEED"]
+    for name in _field_types():
+        value = env.get(ENV_PREFIX + name.upper())
+        if value is not None:
+            settings[name] = value
+    return settings
+
+def argument_parser(parser=None):
+    """Add a --setting flag for every field (--no-setting for booleans) to an ArgumentParser"""
+    parser = parser or argparse.ArgumentParser(description="Space Run")
+    parser.add_argument("--config", help="JSON or TOML settings file")
+    parser.add_argument("--resolution", help="Logical resolution, e.g. 1280x720")
+    for name, kind in _field_types().items():
+        flag = "--" + name.replace("_", "-")
+        if kind is bool:
+            parser.add_argument(flag, dest=name, action=argparse.BooleanOptionalAction, default=None)
+        else:
+            parser.add_argument(flag, dest=name, default=None, metavar=name.upper())
+    return parser
+
+def load_config(path=None, env=None, argv=None, args=None):
+    """Defaults, then a config file, then environment variables, then command-line flags
+
+    Flags come from argv, or from args already parsed by a parser that went
+    through argument_parser() (for scripts with arguments of their own).
+    """
+    env = os.environ if env is None else env
+    if args is None and argv is not None:
+        args = argument_parser().parse_args(argv)
+
+    path = (args and args.config) or path or env.get(ENV_PREFIX + "CONFIG")
+    if path is None:
+        path = next((name for name in CONFIG_FILES if os.path.isfile(name)), None)
+    config = GameConfig()
+    if path:
+        config = config.with_overrides(**read_config_file(path))
+    config = config.with_overrides(**env_settings(env))
+    if args:
+        settings = {name: value for name, value in vars(args).items()
+                    if name in _field_types() and value is not None}
+        if args.resolution:
+            settings["width"], settings["height"] = args.resolution.lower().split("x")
+        config = config.with_overrides(**settings)
+    return config
+
+_default = None
+
+def default_config():
+    """The process-wide config that constants.py is built from; loaded on first use"""
+    global _default
+    if _default is None:
+        _default = load_config()
+    return _default
+
+def set_default_config(config):
+    """Install the process-wide config; must run before constants is first imported"""
+    global _default
+    if "constants" in sys.modules and config != _default:
+        raise RuntimeError("constants is already imported; set the config before importing the game")
+    _default = config
@@ -1,33 +1,38 @@
-import pygame
-
-# Game constants
-# Original values for reference
-ORIGINAL_WIDTH, ORIGINAL_HEIGHT = 800, 400  
-
-# Get the display info to determine full screen dimensions
-pygame.init()
-display_info = pygame.display.Info()
-WIDTH, HEIGHT = display_info.current_w, display_info.current_h
-
-# Calculate scaling factors to maintain proper element sizing
-SCALE_X = WIDTH / ORIGINAL_WIDTH
-SCALE_Y = HEIGHT / ORIGINAL_HEIGHT
-
-# Adjusted constants for full screen
-GRAVITY = 1 * SCALE_Y
-JUMP_STRENGTH = 18 * SCALE_Y
-GROUND_HEIGHT = int(50 * SCALE_Y)
-PLAYER_SIZE = int(40 * SCALE_X)
-OBSTACLE_WIDTH_MIN = int(60 * SCALE_X)
-OBSTACLE_WIDTH_MAX = int(120 * SCALE_X)
-OBSTACLE_MIN_HEIGHT = int(50 * SCALE_Y)
-OBSTACLE_MAX_HEIGHT = int(120 * SCALE_Y)
-GAME_SPEED = 5 * SCALE_X
-MIN_OBSTACLE_DISTANCE = int(150 * SCALE_X)
-MAX_OBSTACLE_DISTANCE = int(300 * SCALE_X)
-SPIKE_WIDTH = int(30 * SCALE_X)
-SPIKE_HEIGHT = int(30 * SCALE_Y)
-SPIKE_CHANCE = 0.3  # 30% chance for a spike instead of a platform
+from config import default_config
+
+# Game constants, taken from the process-wide config (see config.py). Code that is given
+# a GameConfig reads it instead; these stay for everything else.
+CONFIG = default_config()
+
+# Rendering resolution. The game is drawn at WIDTH x HEIGHT and upscaled to the window
+# in one pass, so fill-rate cost follows these settings rather than the monitor size.
+MAX_RENDER_HEIGHT = CONFIG.max_render_height
+RENDER_SCALE = CONFIG.render_scale
+RENDER_SMOOTH = CONFIG.render_smooth
+
+# Constants that depend on the resolution, and the config.metrics field each one is.
+# An automatic resolution queries the desktop, which starts pygame's display, so
+# they are worked out on first use (see __getattr__ below) rather than on import.
+_METRIC_NAMES = {
+    "WIDTH": "width", "HEIGHT": "height",
+    "DISPLAY_WIDTH": "display_width", "DISPLAY_HEIGHT": "display_height",
+    # Scaling factors to maintain proper element sizing
+    "SCALE_X": "scale_x", "SCALE_Y": "scale_y",
+    # Sizes and speeds in pixels
+    "GRAVITY": "gravity",
+    "JUMP_STRENGTH": "jump_strength",
+    "GROUND_HEIGHT": "ground_height",
+    "PLAYER_SIZE": "player_size",
+    "OBSTACLE_WIDTH_MIN": "obstacle_width_min",
+    "OBSTACLE_WIDTH_MAX": "obstacle_width_max",
+    "OBSTACLE_MIN_HEIGHT": "obstacle_min_height",
+    "OBSTACLE_MAX_HEIGHT": "obstacle_max_height",
+    "GAME_SPEED": "game_speed",
+    "MIN_OBSTACLE_DISTANCE": "min_obstacle_distance",
+    "MAX_OBSTACLE_DISTANCE": "max_obstacle_distance",
+    "SPIKE_WIDTH": "spike_width",
+    "SPIKE_HEIGHT": "spike_height",
+}
 
 # Enhanced colors and visuals
 BG_COLOR = (10, 10, 35)  # Darker blue background
@@ -38,17 +43,49 @@ PARTICLE_COLORS = [(255, 255, 150), (255, 200, 100), (255, 150, 100), (255, 220,
 SPIKE_COLOR = (255, 30, 30)  # Red for spikes
 
 # Visual effects constants
-ENABLE_BLOOM = True
-ENABLE_PARALLAX = True
-PARTICLE_FREQUENCY = 0.005  # Lower value means fewer particles
+ENABLE_BLOOM = CONFIG.enable_bloom
+
+# Adaptive quality (see quality.py): effects are dropped a tier at a time when frames run late
+ADAPTIVE_QUALITY = CONFIG.adaptive_quality
+QUALITY_TARGET_FPS = 60  # Frame rate the governor tries to hold
+QUALITY_WINDOW = 60  # Frames averaged before each decision
+QUALITY_DOWN_RATIO = 0.9  # Step down when the average frame's work takes this much of the budget
+QUALITY_UP_RATIO = 0.6  # Step up only when the average frame's work fits in this much
+QUALITY_UP_HOLD = 300  # Frames at a tier before stepping up is considered
+
+# Display sync (the simulation rate and frame caps are read from the config)
+VSYNC = CONFIG.vsync  # Lock rendering to the display refresh where the driver supports it
 
-# High score file
-HIGH_SCORE_FILE = "high_score.json"
+# Generated backgrounds and sprites are kept on disk between runs (see assets.py)
+ASSET_CACHE = CONFIG.asset_cache
+ASSET_SEED = CONFIG.asset_seed  # Change for a different starfield and ground texture
 
-# Set up the display - fullscreen mode
-screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
-pygame.display.set_caption("Geometry Dash - Enhanced Edition")
-clock = pygame.time.Clock()
+# Run history and leaderboard (see scores.py)
+SCORES_DB = "scores.db"
+HIGH_SCORE_FILE = "high_score.json"  # Pre-leaderboard high score, imported into SCORES_DB once
+
+# The last run's input is saved here for replay.py
+REPLAY_FILE = "last_run.replay"
+
+# Game log (see logs.py): JSON lines, rotated by size
+LOG_FILE = "debug_log.jsonl"
+LOG_LEVEL = CONFIG.log_level
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3  # Older logs kept as debug_log.jsonl.1, .2, ...
+
+# The display itself is created by main()
 
 # Add fullscreen toggle flag
-is_fullscreen = True 
\ No newline at end of file
+is_fullscreen = True 
+
+def __getattr__(name):
+    # Resolves every resolution-dependent constant the first time one is asked for
+    if name not in _METRIC_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    metrics = CONFIG.metrics
+    for constant, field in _METRIC_NAMES.items():
+        globals()[constant] = getattr(metrics, field)
+    return globals()[name]
+
+# Star imports include the resolution-dependent names, which resolves them
+__all__ = [name for name in globals() if not name.startswith("_")] + list(_METRIC_NAMES)
@@ -0,0 +1,84 @@
+import math
+import logging
+import pygame
+from constants import *
+
+logger = logging.getLogger(__name__)
+_current = None
+
+def get_surface():
+    """The surface the game draws into: the logical-resolution frame when one is open"""
+    if _current is not None:
+        return _current.surface
+    return pygame.display.get_surface()
+
+# The window plus the logical-resolution surface everything is drawn into
+class Display:
+    """Draws at WIDTH x HEIGHT and presents the frame with a single upscale
+
+    With SCALED the renderer does the upscale on the GPU (and vsync works);
+    otherwise the frame is kept offscreen and scaled into the window with one
+    transform.scale per present. When the logical and window sizes match the
+    window surface is drawn into directly.
+    """
+    def __init__(self, window_size=(DISPLAY_WIDTH, DISPLAY_HEIGHT), fullscreen=False,
+                 vsync=VSYNC, smooth=RENDER_SMOOTH):
+        global _current
+        self.logical_size = (WIDTH, HEIGHT)
+        self.smooth = smooth
+        self.scaled = False
+        self.vsync = False
+        flags = pygame.FULLSCREEN if fullscreen else 0
+        self.window = None
+        if vsync:
+            # pygame only honours vsync on renderer-backed displays, hence SCALED
+            try:
+                self.window = pygame.display.set_mode(self.logical_size, flags | pygame.SCALED, vsync=1)
+                self.scaled = True
+                self.vsync = True
+                logger.info("VSync enabled")
+            except pygame.error:
+                logger.warning("VSync unavailable, rendering unlocked")
+        if self.window is None:
+            self.window = pygame.display.set_mode(window_size, flags)
+        self.window_size = pygame.display.get_window_size()
+
+        if self.scaled or self.window.get_size() == self.logical_size:
+            self.surface = self.window
+        else:
+            self.surface = pygame.Surface(self.logical_size).convert()
+        logger.info(f"Rendering at {WIDTH}x{HEIGHT}, window {self.window_size[0]}x{self.window_size[1]}")
+        _current = self
+
+    @property
+    def offscreen(self):
+        return self.surface is not self.window
+
+    def present(self, rects=None):
+        """Show the frame, or only rects of it (in logical coordinates)"""
+        if not self.offscreen:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+        scale = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+        if rects is None:
+            scale(self.surface, self.window.get_size(), self.window)
+            pygame.display.flip()
+            return
+        # Scale each changed area on its own, rounded outwards to whole window pixels
+        sx = self.window.get_width() / self.logical_size[0]
+        sy = self.window.get_height() / self.logical_size[1]
+        window_rect = self.window.get_rect()
+        updated = []
+        for rect in rects:
+            if not rect:
+                continue
+            left, top = int(rect.left * sx), int(rect.top * sy)
+            target = pygame.Rect(left, top, math.ceil(rect.right * sx) - left,
+                                 math.ceil(rect.bottom * sy) - top).clip(window_rect)
+            if target:
+                scale(self.surface.subsurface(rect), target.size, self.window.subsurface(target))
+                updated.append(target)
+        pygame.display.update(updated)
@@ -0,0 +1,66 @@
+from collections import deque
+
+class EntityIndex:
+    """Entities of one kind kept in x order
+
+    Everything scrolls left at the same speed and new entities spawn to the right,
+    so appending keeps the deque sorted: expiry pops from the left, the rightmost
+    entity is the last one, and collision queries stop at the first entity past
+    the range. Entities need an x position and a rect for their width. With a pool,
+    entities that expire or are removed are released back to it.
+    """
+    def __init__(self, entities=(), pool=None):
+        self._entities = deque()
+        self.pool = pool
+        for entity in entities:
+            self.add(entity)
+
+    def add(self, entity):
+        entities = self._entities
+        if not entities or entities[-1].x <= entity.x:
+            entities.append(entity)
+            return
+        # Out-of-order spawns (power-ups) walk back from the right to their slot
+        index = len(entities) - 1
+        while index > 0 and entities[index - 1].x > entity.x:
+            index -= 1
+        entities.insert(index, entity)
+
+    def remove(self, entity):
+        self._entities.remove(entity)
+        if self.pool:
+            self.pool.release(entity)
+
+    def expire(self, left=0):
+        """Drop entities whose right edge has scrolled past left; returns how many"""
+        entities = self._entities
+        count = 0
+        while entities and entities[0].x + entities[0].rect.width <= left:
+            entity = entities.popleft()
+            if self.pool:
+                self.pool.release(entity)
+            count += 1
+        return count
+
+    def overlapping(self, left, right):
+        """Entities whose x-span overlaps left..right, in x order"""
+        for entity in self._entities:
+            if entity.x >= right:
+                break
+            if entity.x + entity.rect.width > left:
+                yield entity
+
+    def rightmost_x(self, default=None):
+        return self._entities[-1].x if self._entities else default
+
+    def clear(self):
+        if self.pool:
+            for entity in self._entities:
+                self.pool.release(entity)
+        self._entities.clear()
+
+    def __iter__(self):
+        return iter(self._entities)
+
+    def __len__(self):
+        return len(self._entities)
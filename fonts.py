@@ -0,0 +1,88 @@
+import os
+import pygame
+from constants import *
+
+# TTF/OTF files shipped with the game take precedence over system fonts
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+
+# Every font the game uses: name -> (face, size, bold)
+FONT_SPECS = {
+    "score": ("Arial", 36, True),
+    "game_over": ("Arial", 72, True),
+    "info": ("Arial", 24, False),
+    "title": ("Arial", 56, True),
+    "subtitle": ("Arial", 28, False),
+    "menu_info": ("Arial", 20, False),
+    "hud_small": ("Arial", 20, False),
+    "notification_large": ("Arial", int(36 * SCALE_Y), True),
+    "notification_medium": ("Arial", int(28 * SCALE_Y), True),
+    "notification_small": ("Arial", int(24 * SCALE_Y), False),
+    "powerup_icon": ("Arial", int(32 * SCALE_Y), False),
+    "powerup_warning": ("Arial", int(40 * SCALE_Y), True),
+    "profiler": ("Courier", 14, False),
+}
+
+def bundled_font_path(face, bold=False):
+    """Path of a bundled file for face (e.g. fonts/arial-bold.ttf), or None"""
+    stem = face.lower().replace(" ", "") + ("-bold" if bold else "")
+    for ext in (".ttf", ".otf"):
+        path = os.path.join(FONT_DIR, stem + ext)
+        if os.path.isfile(path):
+            return path
+    return None
+
+class FontRegistry:
+    """Loads each (face, size, bold) once and hands out the shared Font
+
+    SysFont scans the system font list on every call, so fonts are resolved up
+    front by preload(). After lock() any font that still has to be constructed
+    is counted in late_loads, which should stay 0 for a whole session.
+    """
+    def __init__(self, specs=FONT_SPECS):
+        self.specs = dict(specs)
+        self._fonts = {}
+        self.loads = 0
+        self.late_loads = 0
+        self.locked = False
+
+    def get(self, name):
+        face, size, bold = self.specs[name]
+        return self.font(face, size, bold)
+
+    __getitem__ = get
+
+    def font(self, face, size, bold=False):
+        key = (face, size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = self._load(face, size, bold)
+        return font
+
+    def _load(self, face, size, bold):
+        self.loads += 1
+        if self.locked:
+            self.late_loads += 1
+        path = bundled_font_path(face, bold)
+        if path is None and bold:
+            # A regular bundled file with synthetic bold beats a different system face
+            path = bundled_font_path(face)
+        if path is not None:
+            font = pygame.font.Font(path, size)
+            font.set_bold(bold and not path.endswith(("-bold.ttf", "-bold.otf")))
+            return font
+        # SysFont falls back to pygame's own default font when the face is missing
+        return pygame.font.SysFont(face, size, bold=bold)
+
+    def preload(self, names=None):
+        """Load the named fonts (all of them by default) ahead of gameplay"""
+        for name in names or list(self.specs):
+            self.get(name)
+
+    def lock(self):
+        """Mark the end of loading; later constructions show up in late_loads"""
+        self.locked = True
+
+    def stats(self):
+        return {"fonts": len(self._fonts), "loads": self.loads, "late_loads": self.late_loads}
+
+fonts = FontRegistry()
@@ -0,0 +1,61 @@
+import random
+from collections import namedtuple
+from constants import *
+from obstacles import Obstacle
+
+POWER_UP_TYPES = ["extra_life", "shield", "score_boost", "slow_time"]
+
+# One planned entity. x is a level coordinate: the distance scrolled when the slot
+# reaches x = 0 on screen. variant is the obstacle pattern or the power-up type.
+LevelSlot = namedtuple("LevelSlot", ["kind", "x", "y", "width", "height", "variant"])
+
+class LevelGenerator:
+    """Seeded source of level content, produced a chunk at a time
+
+    Every gameplay-relevant choice (spacing, kind, size, power-up placement) comes
+    from one random.Random, so a seed and config always produce the same level.
+    """
+    def __init__(self, seed=None, chunk_size=None, start_x=None, config=None):
+        self.config = config or CONFIG
+        # Seeds are unsigned 64-bit, the size a replay stores
+        self.seed = seed % 2 ** 64 if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.chunk_size = chunk_size or self.config.level_chunk_size
+        # Level coordinate of the next obstacle or spike
+        self.next_x = start_x if start_x is not None else self.config.metrics.width
+        self.chunks = 0
+
+    def next_chunk(self):
+        """The next chunk_size obstacles/spikes, with any power-ups in the gaps after them"""
+        rng = self.rng
+        config = self.config
+        m = config.metrics
+        ground_y = m.height - m.ground_height
+        slots = []
+        for _ in range(self.chunk_size):
+            # Add more distance between obstacles
+            gap = rng.randint(m.min_obstacle_distance + 30, m.max_obstacle_distance + 50)
+            x = self.next_x
+
+            if rng.random() < config.spike_chance:
+                # Spikes sit on the ground with a little extra space either side
+                width = rng.randint(m.spike_width, m.spike_width * 2)
+                height = rng.randint(m.spike_height, m.spike_height * 3 // 2)
+                slots.append(LevelSlot("spike", x + 20, ground_y - height,
+                                       width, height, None))
+                self.next_x = x + width + gap + 20
+            else:
+                width = rng.randint(m.obstacle_width_min, m.obstacle_width_max)
+                height = rng.randint(m.obstacle_min_height, m.obstacle_max_height)
+                slots.append(LevelSlot("obstacle", x, ground_y - height,
+                                       width, height, rng.choice(Obstacle.PATTERNS)))
+                self.next_x = x + width + gap
+
+            # Power-ups float in the middle of a gap, clear of both neighbours
+            if rng.random() < config.power_up_chance:
+                size = 30
+                y = rng.randint(m.height // 4, ground_y - 50)
+                slots.append(LevelSlot("power_up", self.next_x - (gap + size) // 2, y,
+                                       size, size, rng.choice(POWER_UP_TYPES)))
+        self.chunks += 1
+        return slots
@@ -0,0 +1,82 @@
+import json
+import queue
+import atexit
+import logging
+import logging.handlers
+from datetime import datetime
+from constants import *
+
+# Simulation step that records are stamped with; main sets it once per frame
+_frame = 0
+_listener = None
+
+def set_frame(frame):
+    global _frame
+    _frame = frame
+
+class FrameStamp(logging.Filter):
+    """Stamps each record with the current frame in the thread that logged it"""
+    def filter(self, record):
+        if not hasattr(record, "frame"):
+            record.frame = _frame
+        return True
+
+# LogRecord attributes that aren't worth a field; anything else passed with extra= is kept
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "frame"}
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, frame, message and any extra= fields"""
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "frame": getattr(record, "frame", None),
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+def start_logging(path=LOG_FILE, level=LOG_LEVEL, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS):
+    """Route every logger to a rotating JSON-lines file written on a background thread
+
+    Loggers only put records on a queue; a QueueListener thread formats and
+    writes them. Calling it again replaces the previous setup and starts a
+    new file.
+    """
+    global _listener
+    stop_logging()
+    records = queue.SimpleQueue()
+    file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                                        encoding="utf-8")
+    file_handler.setFormatter(JsonLinesFormatter())
+    if file_handler.stream.tell():
+        file_handler.doRollover()  # Each session starts a new file; the last ones become .1, .2, ...
+    queue_handler = logging.handlers.QueueHandler(records)
+    queue_handler.addFilter(FrameStamp())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+
+    _listener = logging.handlers.QueueListener(records, file_handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def stop_logging():
+    """Write out everything queued and close the file"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(stop_logging)
@@ -1,19 +1,36 @@
 import pygame
-import random
 import math
 import os
+import time
+import logging
 import platform
 from constants import *
-from player import Player
-from obstacles import Obstacle, Spike, create_obstacles
-from visuals import EnhancedParticle, draw_parallax_background, draw_ground, PowerUp
-from utils import load_high_score, save_high_score, ScreenShake, draw_neon_text
+from visuals import draw_parallax_background, draw_ground, PowerUp, power_up_pool
+from assets import assets
+from display import Display
+from fonts import fonts
+from logs import start_logging, stop_logging, set_frame
+from quality import quality, quality_tiers
+from simulation import GameSimulation, FrameInput
+from replay import InputRecorder, gameplay_settings
+from profiler import FrameProfiler
+from utils import ScreenShake, DirtyRectScreen
+from scores import ScoreStore
+from text_render import draw_cached_neon_text, blit_cached_neon_text, NeonCounter
 from collections import deque
+from pool import ObjectPool
+from obstacles import obstacle_pool, spike_pool
 
 os.environ['SDL_VIDEO_WINDOW_POS'] = '0,0'  # Position window at top-left of screen for better maximize behavior
 
+logger = logging.getLogger(__name__)
+
 class Notification:
     def __init__(self, text, color, duration=120, size="medium"):
+        self.reset(text, color, duration, size)
+    
+    def reset(self, text, color, duration=120, size="medium"):
+        """(Re)initialise with new text; pooled notifications are reused through this"""
         self.text = text
         self.base_color = color
         self.duration = duration
@@ -21,12 +38,9 @@ class Notification:
         self.y_offset = 0
         
         # Choose font size based on importance
-        if size == "large":
-            self.font = pygame.font.SysFont('Arial', int(36 * SCALE_Y), bold=True)
-        elif size == "medium":
-            self.font = pygame.font.SysFont('Arial', int(28 * SCALE_Y), bold=True)
-        else:
-            self.font = pygame.font.SysFont('Arial', int(24 * SCALE_Y))
+        if size not in ("large", "medium"):
+            size = "small"
+        self.font = fonts[f"notification_{size}"]
         
         self.render = self.font.render(self.text, True, self.base_color)
         self.width = self.render.get_width()
@@ -63,22 +77,29 @@ class Notification:
         # Draw with the calculated offset
         surface.blit(text_surf, (x - self.width//2, y + self.y_offset))
 
-def main():
+def main(replay=None, config=None):
+    """Run the game; with a Replay, play back its recorded run instead of reading the keyboard
+
+    config defaults to the process-wide one. Its resolution must be the one the game
+    modules were imported with, since images and layout are built for that.
+    """
+    config = config or CONFIG
+    if replay:
+        config = replay.config(config)  # Gameplay settings and rate as recorded
+    if config.metrics[:2] != (WIDTH, HEIGHT):
+        raise ValueError(f"config resolution {config.metrics.width}x{config.metrics.height} differs from "
+                         f"{WIDTH}x{HEIGHT}; install it with config.set_default_config() before importing main")
+    
     # Initialize pygame with proper flags
     pygame.init()
     
-    # Debug logging
-    import sys
-    debug_log = open('debug_log.txt', 'w')
-    def log(msg):
-        debug_log.write(f"{msg}\n")
-        debug_log.flush()
-    
-    log("Game started")
+    # Debug logging; the game thread only queues records, a background thread writes them
+    start_logging(level=config.log_level)
+    logger.info("Game started")
     
     # Special handling for macOS
     if platform.system() == 'Darwin':  # Darwin is the core of macOS
-        log("Running on macOS")
+        logger.info("Running on macOS")
         # Configure pygame to work better with macOS
         os.environ['SDL_VIDEO_MAC_FULLSCREEN_SPACES'] = '0'
         os.environ['SDL_VIDEO_WINDOW_POS'] = '0,0'  # Position window at top-left of screen
@@ -92,11 +113,12 @@ def main():
     # Set up display with a fixed size (no RESIZABLE flag)
     pygame.display.set_caption("Space Run")
     
-    # Create the window - either fullscreen or fixed size
-    if FULLSCREEN:
-        screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
-    else:
-        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    # Create the window - either fullscreen or fixed size. Everything draws into
+    # screen at the logical resolution; display.present() upscales it once.
+    display = Display(fullscreen=FULLSCREEN, vsync=config.vsync, smooth=config.render_smooth)
+    screen = display.surface
+    # The unfiltered-upscale tier only saves time when the frame is smoothscaled in software
+    quality.tiers = quality_tiers(config.render_smooth and display.offscreen)
     
     # Force processing of events to help with input focus
     for _ in range(3):  # Process multiple times to ensure we catch everything
@@ -104,48 +126,53 @@ def main():
         pygame.event.get()
     
     # Ensure window has focus
-    pygame.display.flip()
+    display.present()
     pygame.event.clear()  # Clear any pending events
     
-    # Create game objects
-    player = Player()
-    obstacles, spikes = create_obstacles()
+    # Per-phase frame timing, toggled in game with F3
+    profiler = FrameProfiler()
     
-    # Game variables
-    score = 0
-    lives = 3  # Added lives system
-    high_score = load_high_score()
-    game_over = False
+    # Game state lives in the simulation; the rest is presentation
+    world = GameSimulation(profiler, config=config)
+    scores = ScoreStore(SCORES_DB, legacy_file=HIGH_SCORE_FILE)
+    high_score = scores.personal_best()
     bg_offset = 0
     pulse_value = 0
     pulse_dir = 1
-    particles = []
     screen_shake = ScreenShake()
-    power_ups = []  # List for power-ups
-    invincibility_timer = 0  # For temporary invincibility after hit
-    notifications = deque(maxlen=5)  # Limit to 5 notifications at once
-    active_powerups = []  # Track active power-ups with their timers
+    notifications = deque()
+    notification_pool = ObjectPool(Notification, maxsize=8)
+    
+    # Load every font once; nothing should construct one after this
+    fonts.preload()
+    fonts.lock()
+    score_font = fonts["score"]
+    game_over_font = fonts["game_over"]
+    info_font = fonts["info"]
+    
+    # HUD labels re-render only when their number changes
+    score_counter = NeonCounter("Score: ", score_font, (255, 255, 255), (150, 150, 150), 3)
+    high_score_counter = NeonCounter("High Score: ", info_font, (200, 200, 0))
     
-    # Create fonts
-    score_font = pygame.font.SysFont('Arial', 36, bold=True)
-    game_over_font = pygame.font.SysFont('Arial', 72, bold=True)
-    info_font = pygame.font.SysFont('Arial', 24)
+    # Current quality tier, shown under the high score; re-rendered when it changes
+    def render_quality_label():
+        return fonts["hud_small"].render(f"Quality: {quality.tier.name}", True, (150, 150, 150))
+    quality_label = render_quality_label()
     
     # Load heart image for lives display
     heart_img = pygame.Surface((20, 20), pygame.SRCALPHA)
     pygame.draw.polygon(heart_img, (255, 50, 50), [(10, 5), (5, 0), (0, 5), (0, 12), (10, 19), (20, 12), (20, 5), (15, 0)])
     
-    # Near the top of the main function, add a variable to track normal game speed
-    normal_game_speed = GAME_SPEED
-    current_game_speed = normal_game_speed
+    # Menus advance their animations in 60 Hz units so they look the same at any menu_fps
+    menu_steps = config.simulation_rate / config.menu_fps
     
     # Title screen loop
     def show_title_screen():
-        nonlocal bg_offset, pulse_value, pulse_dir
+        nonlocal pulse_value, pulse_dir
         
-        title_font = pygame.font.SysFont('Arial', 56, bold=True)
-        subtitle_font = pygame.font.SysFont('Arial', 28)
-        info_font = pygame.font.SysFont('Arial', 20)
+        title_font = fonts["title"]
+        subtitle_font = fonts["subtitle"]
+        info_font = fonts["menu_info"]
         
         # Create mini power-up examples
         mini_powerups = []
@@ -166,40 +193,27 @@ def main():
         # Show explanation toggle
         show_explanations = False
         
-        while True:
-            # Process all events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    return False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        return True  # Continue to game
-                    if event.key == pygame.K_h:
-                        show_explanations = not show_explanations
-                    if event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
-                        pygame.quit()
-                        return False
-                    if event.key == pygame.K_F11:
-                        toggle_fullscreen()
-                elif event.type == pygame.ACTIVEEVENT:
-                    if event.gain:  # Window gained focus
-                        pygame.event.clear()  # Clear any pending events
-                        pygame.key.set_repeat(500, 30)  # Reset key repeat
-            
+        # Only the pulsing lines change between frames; everything else is one cached layer
+        menu = DirtyRectScreen(display)
+        subtitle_text = subtitle_font.render("Press SPACE to play", True, (255, 255, 255))
+        quit_text = subtitle_font.render("Press Q to QUIT", True, (255, 100, 100))
+        quit_x = WIDTH//2 - quit_text.get_width()//2
+        quit_y = HEIGHT//2 + 100
+        
+        # Subtle glow behind the quit text; its pulse is applied as surface alpha
+        quit_glow = pygame.Surface((quit_text.get_width() + 20, quit_text.get_height() + 10), pygame.SRCALPHA)
+        pygame.draw.rect(quit_glow, (255, 50, 50, 50), 
+                       (0, 0, quit_text.get_width() + 20, quit_text.get_height() + 10),
+                       border_radius=10)
+        
+        def draw_static(surface):
             # Draw title screen background
-            draw_parallax_background(bg_offset)
-            bg_offset += 1  # Slow background scroll
-            draw_ground()
-            
-            # Pulsing effect for text
-            pulse_value += 0.03 * pulse_dir
-            if pulse_value > 1 or pulse_value < 0:
-                pulse_dir *= -1
+            draw_parallax_background(bg_offset, surface, config)
+            draw_ground(bg_offset * 2, surface, config)
             
             # Always draw the title, regardless of mode
             title_pos = (WIDTH//2, HEIGHT//5)  # Move title higher up
-            draw_neon_text(screen, "SPACE RUN", title_font, 
+            draw_cached_neon_text(surface, "SPACE RUN", title_font, 
                           (50, 255, 255),  # Brighter cyan color
                           (title_pos[0] - title_font.size("SPACE RUN")[0]//2, title_pos[1]),
                           (40, 180, 255), 8)
@@ -209,85 +223,146 @@ def main():
                 panel_rect = pygame.Rect(WIDTH//4, HEIGHT//3, WIDTH//2, HEIGHT//2)
                 panel_surface = pygame.Surface((panel_rect.width, panel_rect.height), pygame.SRCALPHA)
                 panel_surface.fill((0, 0, 30, 200))  # Semi-transparent dark blue
-                screen.blit(panel_surface, panel_rect)
+                surface.blit(panel_surface, panel_rect)
                 
                 # Draw help title
                 help_text = info_font.render("POWER-UPS GUIDE", True, (255, 255, 255))
-                screen.blit(help_text, (WIDTH//2 - help_text.get_width()//2, panel_rect.y + 20))
+                surface.blit(help_text, (WIDTH//2 - help_text.get_width()//2, panel_rect.y + 20))
                 
                 # Draw each powerup with description
                 for i, (mini_pu, desc) in enumerate(mini_powerups):
                     mini_pu.y = panel_rect.y + 60 + i*40  # Position within panel
-                    mini_pu.x = panel_rect.x + 30  # Align to left of panel
-                    mini_pu.draw(screen)
+                    mini_pu.x = mini_pu.prev_x = panel_rect.x + 30  # Align to left of panel
+                    mini_pu.draw(surface)
                     
                     # Draw description
                     desc_text = info_font.render(desc, True, (255, 255, 255))
-                    screen.blit(desc_text, (mini_pu.x + 30, mini_pu.y))
+                    surface.blit(desc_text, (mini_pu.x + 30, mini_pu.y))
                 
                 # Back instruction
                 back_text = info_font.render("Press H to return", True, (200, 200, 200))
-                screen.blit(back_text, (WIDTH//2 - back_text.get_width()//2, panel_rect.y + panel_rect.height - 30))
+                surface.blit(back_text, (WIDTH//2 - back_text.get_width()//2, panel_rect.y + panel_rect.height - 30))
             else:
-                # Draw subtitle with pulse
-                subtitle_alpha = 100 + int(155 * pulse_value)
-                subtitle_text = subtitle_font.render("Press SPACE to play", True, (255, 255, 255))
-                subtitle_text.set_alpha(subtitle_alpha)
-                screen.blit(subtitle_text, 
-                          (WIDTH//2 - subtitle_text.get_width()//2, HEIGHT//2))
-                
                 # Draw high score
                 high_score_text = subtitle_font.render(f"High Score: {high_score}", True, (255, 230, 0))
-                screen.blit(high_score_text, 
+                surface.blit(high_score_text, 
                           (WIDTH//2 - high_score_text.get_width()//2, HEIGHT//2 + 50))
                 
-                # Add QUIT option with highlight
-                quit_text = subtitle_font.render("Press Q to QUIT", True, (255, 100, 100))
-                # Add subtle glow effect that pulses
-                glow_intensity = 0.5 + 0.5 * pulse_value
-                quit_x = WIDTH//2 - quit_text.get_width()//2
-                quit_y = HEIGHT//2 + 100
+                # Help instruction
+                help_text = info_font.render("Press H for power-up guide", True, (200, 200, 200))
+                surface.blit(help_text, (WIDTH//2 - help_text.get_width()//2, HEIGHT - 100))
+        
+        while True:
+            # Process all events
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    return False
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        return True  # Continue to game
+                    if event.key == pygame.K_h:
+                        show_explanations = not show_explanations
+                        menu.invalidate()
+                    if event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
+                        pygame.quit()
+                        return False
+                    if event.key == pygame.K_F11:
+                        toggle_fullscreen()
+                elif event.type == pygame.ACTIVEEVENT:
+                    if event.gain:  # Window gained focus
+                        pygame.event.clear()  # Clear any pending events
+                        pygame.key.set_repeat(500, 30)  # Reset key repeat
+                        menu.invalidate()  # Repaint everything after being covered
+            
+            menu.begin_frame(draw_static)
+            
+            # Pulsing effect for text
+            pulse_value += 0.03 * pulse_dir * menu_steps
+            if pulse_value > 1 or pulse_value < 0:
+                pulse_dir *= -1
+            
+            if not show_explanations:
+                # Draw subtitle with pulse
+                subtitle_text.set_alpha(100 + int(155 * pulse_value))
+                menu.mark(screen.blit(subtitle_text, 
+                          (WIDTH//2 - subtitle_text.get_width()//2, HEIGHT//2)))
                 
-                # Draw subtle glow behind text
-                glow_surf = pygame.Surface((quit_text.get_width() + 20, quit_text.get_height() + 10), pygame.SRCALPHA)
-                pygame.draw.rect(glow_surf, (255, 50, 50, int(50 * glow_intensity)), 
-                               (0, 0, quit_text.get_width() + 20, quit_text.get_height() + 10),
-                               border_radius=10)
-                screen.blit(glow_surf, (quit_x - 10, quit_y - 5))
+                # Add subtle glow effect that pulses behind the QUIT option
+                glow_intensity = 0.5 + 0.5 * pulse_value
+                quit_glow.set_alpha(int(255 * glow_intensity))
+                menu.mark(screen.blit(quit_glow, (quit_x - 10, quit_y - 5)))
                 
                 # Draw the text
                 screen.blit(quit_text, (quit_x, quit_y))
-                
-                # Help instruction
-                help_text = info_font.render("Press H for power-up guide", True, (200, 200, 200))
-                screen.blit(help_text, (WIDTH//2 - help_text.get_width()//2, HEIGHT - 100))
             
-            pygame.display.flip()
-            clock.tick(60)
+            menu.present()
+            clock.tick(config.menu_fps)
     
     # Game over screen
     def show_game_over_screen():
-        nonlocal game_over, score, high_score, bg_offset, pulse_value, pulse_dir
+        nonlocal high_score, pulse_value, pulse_dir
+        score = world.score
+        particles = world.particles
         
         # Check for new high score
         new_high_score = False
         if score > high_score:
-            high_score = score
-            save_high_score(high_score)
+            high_score = score  # The run itself is already queued for the score store
             new_high_score = True
         
         # Create particles for game over effect
-        for _ in range(50):
-            particles.append(EnhancedParticle(
-                WIDTH//2 + random.randint(-100, 100),
-                HEIGHT//2 + random.randint(-50, 50),
-                "explode"
-            ))
+        particles.emit(WIDTH//2, HEIGHT//2, "explode", 50, spread=(100, 50))
         
         # Start screen shake
         screen_shake.start(10, 20)
         
-        while game_over:
+        # The frozen world is one cached layer; the headline text joins it once the shake settles
+        menu = DirtyRectScreen(display)
+        text_settled = False
+        game_over_text = "GAME OVER"
+        text_y = HEIGHT//3
+        score_text = f"Score: {score}"
+        score_y = text_y + 100
+        restart_render = info_font.render("Press R to restart, Q to quit", True, (200, 200, 200))
+        particle_rect = None
+        
+        def draw_text(surface, shake_offset):
+            # Draw game over text with glow
+            rects = [blit_cached_neon_text(surface, game_over_text, game_over_font, 
+                         (255, 50, 50), 
+                         (WIDTH//2 - game_over_font.size(game_over_text)[0]//2 + shake_offset[0], 
+                          text_y + shake_offset[1]),
+                         (255, 100, 100), 15)]
+            
+            # Draw score
+            rects.append(blit_cached_neon_text(surface, score_text, score_font, 
+                         (255, 255, 255), 
+                         (WIDTH//2 - score_font.size(score_text)[0]//2 + shake_offset[0], 
+                          score_y + shake_offset[1])))
+            
+            if not new_high_score:
+                high_score_text = f"High Score: {high_score}"
+                rects.append(blit_cached_neon_text(surface, high_score_text, info_font, 
+                             (200, 200, 0), 
+                             (WIDTH//2 - info_font.size(high_score_text)[0]//2, score_y + 50)))
+            return rects
+        
+        def draw_static(surface):
+            # Draw game over screen background
+            draw_parallax_background(bg_offset, surface, config)
+            draw_ground(bg_offset * 2, surface, config)
+            
+            # Draw existing obstacles and spikes
+            for obstacle in world.obstacles.overlapping(0, WIDTH):
+                obstacle.draw(surface)
+            for spike in world.spikes.overlapping(0, WIDTH):
+                spike.draw(surface)
+            
+            if text_settled:
+                draw_text(surface, (0, 0))
+        
+        while world.game_over:
             # Process all events
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -305,77 +380,50 @@ def main():
                     if event.gain:  # Window gained focus
                         pygame.event.clear()  # Clear any pending events
                         pygame.key.set_repeat(500, 30)  # Reset key repeat
+                        menu.invalidate()  # Repaint everything after being covered
             
             # Get screen shake offset
             shake_offset = screen_shake.update()
+            if not text_settled and screen_shake.duration == 0:
+                text_settled = True
+                menu.invalidate()
             
-            # Draw game over screen
-            draw_parallax_background(bg_offset)
-            bg_offset += 0.5  # Slower background scroll when game over
-            draw_ground()
-            
-            # Draw existing obstacles and spikes
-            for obstacle in obstacles:
-                obstacle.draw(screen)
-            for spike in spikes:
-                spike.draw(screen)
+            menu.begin_frame(draw_static)
+            if not text_settled:
+                for rect in draw_text(screen, shake_offset):
+                    menu.mark(rect)
             
             # Update pulse effect
-            pulse_value += 0.05 * pulse_dir
+            pulse_value += 0.05 * pulse_dir * menu_steps
             if pulse_value > 1 or pulse_value < 0:
                 pulse_dir *= -1
             
-            # Draw game over text with glow
-            game_over_text = "GAME OVER"
-            text_y = HEIGHT//3
-            draw_neon_text(screen, game_over_text, game_over_font, 
-                         (255, 50, 50), 
-                         (WIDTH//2 - game_over_font.size(game_over_text)[0]//2 + shake_offset[0], 
-                          text_y + shake_offset[1]),
-                         (255, 100, 100), 15)
-            
-            # Draw score
-            score_text = f"Score: {score}"
-            score_y = text_y + 100
-            draw_neon_text(screen, score_text, score_font, 
-                         (255, 255, 255), 
-                         (WIDTH//2 - score_font.size(score_text)[0]//2 + shake_offset[0], 
-                          score_y + shake_offset[1]))
-            
             # Draw high score message
             if new_high_score:
                 # Pulsing effect for high score text
                 glow_intensity = 0.5 + 0.5 * pulse_value
                 
                 high_score_text = "NEW HIGH SCORE!"
-                draw_neon_text(screen, high_score_text, score_font, 
+                menu.mark(blit_cached_neon_text(screen, high_score_text, score_font, 
                              (255, 255, 0), 
                              (WIDTH//2 - score_font.size(high_score_text)[0]//2, score_y + 50),
-                             (255, 200, 0), int(15 * glow_intensity))
-            else:
-                high_score_text = f"High Score: {high_score}"
-                draw_neon_text(screen, high_score_text, info_font, 
-                             (200, 200, 0), 
-                             (WIDTH//2 - info_font.size(high_score_text)[0]//2, score_y + 50))
+                             (255, 200, 0), int(15 * glow_intensity)))
             
             # Draw restart instruction
-            restart_text = "Press R to restart, Q to quit"
-            restart_alpha = 100 + int(155 * pulse_value)
-            restart_render = info_font.render(restart_text, True, (200, 200, 200))
-            restart_render.set_alpha(restart_alpha)
-            screen.blit(restart_render, 
-                      (WIDTH//2 - restart_render.get_width()//2, HEIGHT - 150))
-            
-            # Update and draw particles
-            for particle in list(particles):
-                particle.update()
-                if particle.lifetime <= 0:
-                    particles.remove(particle)
-                else:
-                    particle.draw(screen)
-            
-            pygame.display.flip()
-            clock.tick(60)
+            restart_render.set_alpha(100 + int(155 * pulse_value))
+            menu.mark(screen.blit(restart_render, 
+                      (WIDTH//2 - restart_render.get_width()//2, HEIGHT - 150)))
+            
+            # Update and draw particles until the explosion has faded out
+            if particle_rect or len(particles):
+                for _ in range(int(menu_steps)):
+                    particles.update()
+                particles.draw(screen)
+                particle_rect = particles.bounds()
+                menu.mark(particle_rect)
+            
+            menu.present()
+            clock.tick(config.menu_fps)
         
         return True  # Default to continue
     
@@ -384,31 +432,75 @@ def main():
     clock = pygame.time.Clock()
     
     while running:
-        # Show title screen
-        if not show_title_screen():
+        # Show title screen (replays go straight into the recorded run)
+        if replay is None and not show_title_screen():
             break
         
-        # Reset game state for new game
-        player = Player()
-        obstacles, spikes = create_obstacles()
-        power_ups = []  # Reset power-ups
-        score = 0
-        lives = 3  # Reset lives
-        game_over = False
-        invincibility_timer = 0
-        particles.clear()
-        
-        # Main gameplay loop
-        while not game_over:
-            # Handle events
+        # Gameplay-only sprites are built here rather than before the first title frame
+        assets.preload(["player", "particle_atlas"])
+        
+        # Reset game state for new game, recycling the last run's entities
+        world.close()
+        if replay:
+            world = GameSimulation(profiler, seed=replay.seed, config=config)
+            replay_inputs = replay.inputs()
+            logger.info(f"Replaying seed {world.seed}, {replay.steps} steps")
+        else:
+            world = GameSimulation(profiler, config=config)
+            logger.info(f"Level seed {world.seed}", extra={"seed": world.seed})  # Set SPACE_RUN_SEED to replay this level
+        
+        # Every step's input is recorded, so the run can be replayed exactly
+        recorder = InputRecorder(world.seed, config.simulation_rate, (WIDTH, HEIGHT),
+                                 gameplay_settings(config))
+        
+        # Main gameplay loop - the world advances in fixed steps, drawing happens once per
+        # frame and interpolates between the last two steps
+        sim_step = 1.0 / config.simulation_rate
+        accumulator = 0.0
+        previous_time = time.perf_counter()
+        prev_bg_offset = bg_offset
+        shake_offset = (0, 0)
+        jump_pressed = False
+        frame_work = 0.0
+        quality.reset()  # Title and game-over frames don't count towards the quality window
+        run_started = previous_time
+        frames = 0
+        worst_frame = 0.0
+        
+        while running and not world.game_over:
+            profiler.begin_frame()
+            now = time.perf_counter()
+            set_frame(world.frame)  # Stamped on every log record from this frame
+            frame_time = now - previous_time
+            frames += 1
+            worst_frame = max(worst_frame, frame_time)
+            
+            # Adapt effects to the measured frame time
+            if quality.record(frame_time, frame_work):
+                interval, work = quality.measured
+                logger.info(f"Quality tier {quality.level} ({quality.tier.name}), "
+                    f"frames took {interval * 1000:.1f} ms ({work * 1000:.1f} ms of work)")
+                if quality.lowest:
+                    # The logical resolution is fixed at startup, so rendering smaller needs a restart
+                    logger.warning("Lowest quality tier reached; raise render_scale or lower max_render_height to render fewer pixels")
+                display.smooth = config.render_smooth and quality.tier.filtered_upscale
+                quality_label = render_quality_label()
+            
+            # Cap the catch-up after a stall (window drag, breakpoint) instead of fast-forwarding
+            accumulator += min(frame_time, config.max_steps_per_frame * sim_step)
+            previous_time = now
+            
+            # Handle events; a press is held over until a simulation step consumes it
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_SPACE or event.key == pygame.K_UP:
-                        player.jump()
+                        jump_pressed = True
                     if event.key == pygame.K_F11:  # Toggle fullscreen
                         toggle_fullscreen()
+                    if event.key == pygame.K_F3:  # Toggle frame profiler overlay
+                        profiler.toggle()
                 elif event.type == pygame.ACTIVEEVENT:
                     if event.gain:  # Window gained focus
                         pygame.event.clear()  # Clear any pending events
@@ -416,231 +508,89 @@ def main():
             
             # Get keyboard state
             keys = pygame.key.get_pressed()
-            if keys[pygame.K_SPACE] or keys[pygame.K_UP]:
-                player.jump()
-            
-            # Update game objects
-            bg_offset += current_game_speed//2  # Background parallax effect
-            
-            # Update invincibility timer
-            if invincibility_timer > 0:
-                invincibility_timer -= 1
-            
-            # Remove obstacles/spikes that have moved off-screen
-            obstacles = [o for o in obstacles if o.x > -o.width]
-            spikes = [s for s in spikes if s.x > -s.width]
-            power_ups = [p for p in power_ups if p.x > -p.size]
-            
-            # Create new obstacles/spikes as needed
-            if len(obstacles) + len(spikes) < 5:
-                # Find the rightmost x position
-                rightmost_x = WIDTH
-                if obstacles:
-                    rightmost_x = max(rightmost_x, max(o.x for o in obstacles))
-                if spikes:
-                    rightmost_x = max(rightmost_x, max(s.x for s in spikes))
+            jump_held = bool(keys[pygame.K_SPACE] or keys[pygame.K_UP])
+            profiler.mark("input")
+            
+            # Run every simulation step that is due; after a slow frame several run
+            # back to back and the frames in between are simply never drawn
+            while accumulator >= sim_step and not world.game_over:
+                inputs = FrameInput(jump_pressed, jump_held)
+                if replay:
+                    inputs = next(replay_inputs, None)
+                    if inputs is None:  # The recording ended before a game over
+                        running = False
+                        break
+                recorder.record(inputs)
+                world.step(inputs)
+                jump_pressed = False
+                accumulator -= sim_step
                 
-                # Place new obstacle/spike
-                new_x = max(WIDTH, rightmost_x + random.randint(MIN_OBSTACLE_DISTANCE, MAX_OBSTACLE_DISTANCE))
+                for event in world.events:
+                    if event[0] == "notify":
+                        # Limit to 5 notifications at once
+                        if len(notifications) == 5:
+                            notification_pool.release(notifications.popleft())
+                        notifications.append(notification_pool.acquire(event[1], event[2], size=event[3]))
+                    elif event[0] == "shake":
+                        screen_shake.start(event[1], event[2])
                 
-                # Randomly choose between obstacle and spike
-                if random.random() < SPIKE_CHANCE:
-                    # Create spike with proper parameters
-                    spike_width = random.randint(SPIKE_WIDTH, SPIKE_WIDTH * 2)
-                    spike_height = random.randint(SPIKE_HEIGHT, SPIKE_HEIGHT * 3 // 2)
-                    spike_y = HEIGHT - GROUND_HEIGHT - spike_height
-                    spikes.append(Spike(new_x, spike_y, spike_width, spike_height))
-                else:
-                    obstacles.append(Obstacle(new_x))
-            
-            # Spawn power-ups occasionally
-            if random.random() < 0.005 and len(power_ups) < 2:  # 0.5% chance each frame
-                # Choose a clear spot for the power-up
-                power_up_x = WIDTH + random.randint(50, 200)
-                power_up_y = random.randint(HEIGHT // 4, HEIGHT - GROUND_HEIGHT - 50)
+                prev_bg_offset = bg_offset
+                bg_offset += world.current_game_speed//2  # Background parallax effect
+                shake_offset = screen_shake.update()
                 
-                # Choose a random power-up type
-                power_up_type = random.choice(["extra_life", "shield", "score_boost", "slow_time"])
-                power_ups.append(PowerUp(power_up_x, power_up_y, power_up_type))
+                # Update and remove expired notifications
+                for notification in list(notifications):
+                    if not notification.update():
+                        notifications.remove(notification)
+                        notification_pool.release(notification)
             
-            # Update obstacles
-            for obstacle in obstacles:
-                obstacle.update(current_game_speed)
-                
-                # Add score when passing
-                if not obstacle.passed and obstacle.x + obstacle.width < player.x:
-                    obstacle.passed = True
-                    score += 1
-            
-            # Update spikes
-            for spike in spikes:
-                spike.update(current_game_speed)
-                
-                # Add score when passing
-                if not spike.passed and spike.x + spike.width < player.x:
-                    spike.passed = True
-                    score += 1
-            
-            # Update power-ups
-            for power_up in list(power_ups):
-                power_up.update(current_game_speed)
-                
-                # Check for power-up collection
-                if player.rect.colliderect(power_up.rect):
-                    power_ups.remove(power_up)
-                    
-                    # Apply power-up effect
-                    if power_up.type == "extra_life":
-                        old_lives = lives
-                        lives = min(lives + 1, 5)  # Maximum 5 lives
-                        
-                        # Only show notification if player actually gained a life
-                        if lives > old_lives:
-                            notifications.append(Notification("Extra Life!", (255, 50, 50), size="medium"))
-                        
-                        # Add special effect for life gain
-                        for _ in range(20):
-                            particles.append(EnhancedParticle(
-                                player.rect.centerx, player.rect.centery, "trail"))
-                    
-                    elif power_up.type == "shield":
-                        invincibility_timer = 300  # 5 seconds at 60 FPS
-                        notifications.append(Notification("Shield Activated!", (50, 100, 255), size="medium"))
-                        
-                        # Add to active power-ups
-                        active_powerups.append({
-                            "type": "shield",
-                            "timer": invincibility_timer,
-                            "icon": "🛡️",
-                            "color": (50, 100, 255)
-                        })
-                        
-                        # Add shield effect particles
-                        for _ in range(30):
-                            particles.append(EnhancedParticle(
-                                player.rect.centerx, player.rect.centery, "shield"))
-                    
-                    elif power_up.type == "score_boost":
-                        score += 10
-                        notifications.append(Notification("+10 Points!", (255, 215, 0), size="medium"))
-                        
-                        # Add score boost effect
-                        for _ in range(15):
-                            particles.append(EnhancedParticle(
-                                player.rect.centerx, player.rect.centery, "score"))
-                    
-                    elif power_up.type == "slow_time":
-                        # Apply slow time effect - now 50% of normal speed instead of 30%
-                        notifications.append(Notification("Time Slowed!", (180, 180, 255), size="medium"))
-                        
-                        # Slow game speed to 50% of normal
-                        current_game_speed = normal_game_speed * 0.5
-                        
-                        # Add to active power-ups list
-                        active_powerups.append({
-                            "type": "slow_time",
-                            "timer": 300,  # 5 seconds
-                            "icon": "⏱️",
-                            "color": (180, 180, 255),
-                            "original_speed": normal_game_speed
-                        })
-                        
-                        # Add time slowing effect particles
-                        for _ in range(20):
-                            particles.append(EnhancedParticle(
-                                player.rect.centerx, player.rect.centery, "shield"))
-            
-            # Check for collisions
-            collision = player.update(obstacles, spikes)
-            if collision and invincibility_timer <= 0:
-                lives -= 1
-                if lives <= 0:
-                    game_over = True
-                    screen_shake.start(10, 20)
-                else:
-                    # Player still has lives, show notification with remaining lives
-                    life_text = f"{lives} {'Lives' if lives > 1 else 'Life'} Remaining"
-                    notifications.append(Notification(life_text, (255, 50, 50), size="large"))
-                    
-                    # Create an impactful visual effect
-                    for _ in range(15):
-                        particles.append(EnhancedParticle(
-                            player.rect.centerx, 
-                            player.rect.centery, 
-                            "explode"
-                        ))
-                        
-                    # Player still has lives
-                    invincibility_timer = 120  # 2 seconds of invincibility
-                    screen_shake.start(5, 10)  # Smaller screen shake for hit
-            
-            # Generate occasional background particles (reduced frequency)
-            if random.random() < 0.005:  # Reduced from 0.01
-                particles.append(EnhancedParticle(
-                    random.randint(0, WIDTH),
-                    random.randint(0, HEIGHT - GROUND_HEIGHT),
-                    "trail"
-                ))
-            
-            # Update background particles
-            for particle in list(particles):
-                particle.update()
-                if particle.lifetime <= 0:
-                    particles.remove(particle)
-            
-            # Drawing
-            shake_offset = screen_shake.update()
+            # How far we are between the last step and the next one
+            interp = accumulator / sim_step
+            draw_bg_offset = prev_bg_offset + (bg_offset - prev_bg_offset) * interp
             
             # Apply screen shake
             draw_offset_x, draw_offset_y = shake_offset
             
             # Draw background
-            draw_parallax_background(bg_offset)
+            draw_parallax_background(draw_bg_offset, screen, config)
+            profiler.mark("background")
             
-            # Draw ground
-            draw_ground()
+            # Draw ground - it scrolls at game speed, twice the background's rate
+            draw_ground(draw_bg_offset * 2, screen, config)
+            profiler.mark("ground")
             
-            # Draw power-ups
-            for power_up in power_ups:
-                power_up.draw(screen)
+            # Draw power-ups - entities are built a screen ahead, so only draw the visible ones
+            for power_up in world.power_ups.overlapping(0, WIDTH):
+                power_up.draw(screen, interp)
             
             # Draw obstacles and spikes
-            for obstacle in obstacles:
-                obstacle.draw(screen)
+            for obstacle in world.obstacles.overlapping(0, WIDTH):
+                obstacle.draw(screen, interp)
             
-            for spike in spikes:
-                spike.draw(screen)
+            for spike in world.spikes.overlapping(0, WIDTH):
+                spike.draw(screen, interp)
             
             # Draw player - make player blink if invincible
-            if invincibility_timer <= 0 or pygame.time.get_ticks() % 10 < 7:
-                player.draw(screen)
+            if world.invincibility_timer <= 0 or pygame.time.get_ticks() % 10 < 7:
+                world.player.draw(screen, interp)
+            profiler.mark("entities")
             
             # Draw background particles
-            for particle in particles:
-                particle.draw(screen)
+            world.particles.draw(screen)
+            profiler.mark("particles")
             
             # Draw score with glow effect (reduced glow)
-            score_text = f"Score: {score}"
-            draw_neon_text(screen, score_text, score_font, 
-                         (255, 255, 255), 
-                         (20 + draw_offset_x, 20 + draw_offset_y),
-                         (150, 150, 150), 3)  # Reduced glow radius from 5 to 3
+            score_counter.draw(screen, world.score, (20 + draw_offset_x, 20 + draw_offset_y))
             
             # Draw lives
-            for i in range(lives):
+            for i in range(world.lives):
                 screen.blit(heart_img, (20 + i * 25 + draw_offset_x, 70 + draw_offset_y))
             
             # Draw high score (with reduced glow)
-            high_score_text = f"High Score: {high_score}"
-            high_score_color = (255, 255, 0) if score >= high_score else (200, 200, 0)
-            draw_neon_text(screen, high_score_text, info_font, 
-                         high_score_color, 
-                         (20 + draw_offset_x, 100 + draw_offset_y))
-            
-            # Update and remove expired notifications
-            for notification in list(notifications):
-                if not notification.update():
-                    notifications.remove(notification)
+            high_score_color = (255, 255, 0) if world.score >= high_score else (200, 200, 0)
+            high_score_counter.draw(screen, high_score, (20 + draw_offset_x, 100 + draw_offset_y), 
+                                    high_score_color)
+            screen.blit(quality_label, (20 + draw_offset_x, 130 + draw_offset_y))
             
             # Draw notifications
             notification_y = HEIGHT // 4
@@ -648,27 +598,15 @@ def main():
                 notification.draw(screen, WIDTH // 2, notification_y)
                 notification_y += 50 * SCALE_Y
             
-            # Update and display active power-ups - made much more obvious
+            # Display active power-ups - made much more obvious
             powerup_x = WIDTH - 220 * SCALE_X  # Moved more to the left for more space
             powerup_y = 20 * SCALE_Y
             
-            for powerup in list(active_powerups):
-                powerup["timer"] -= 1
-                
-                # Remove expired power-ups
-                if powerup["timer"] <= 0:
-                    active_powerups.remove(powerup)
-                    if powerup["type"] == "shield":
-                        invincibility_timer = 0
-                    elif powerup["type"] == "slow_time":
-                        current_game_speed = normal_game_speed
-                    continue
-                
+            for powerup in world.active_powerups:
                 # Draw power-up indicator with timer - ENHANCED
                 remaining_seconds = math.ceil(powerup["timer"] / 60)
                 icon_text = f"{powerup['icon']} {remaining_seconds}s"
-                icon_font = pygame.font.SysFont('Arial', int(32 * SCALE_Y))  # Larger font
-                icon_surf = icon_font.render(icon_text, True, powerup["color"])
+                icon_surf = fonts["powerup_icon"].render(icon_text, True, powerup["color"])
                 
                 # Create larger, more noticeable background
                 bg_rect = pygame.Rect(powerup_x - 15, powerup_y - 10, 
@@ -716,18 +654,63 @@ def main():
                 # If very low time, add additional indicator
                 if powerup["timer"] < 60:  # Last second
                     warning_text = "!"
-                    warning_font = pygame.font.SysFont('Arial', int(40 * SCALE_Y), bold=True)
-                    warning_surf = warning_font.render(warning_text, True, (255, 50, 50))
+                    warning_surf = fonts["powerup_warning"].render(warning_text, True, (255, 50, 50))
                     screen.blit(warning_surf, (bg_rect.x + bg_rect.width + 5, bg_rect.y))
                 
                 powerup_y += bg_rect.height + 15  # More spacing between power-ups
             
-            pygame.display.flip()
-            clock.tick(60)
+            profiler.mark("hud")
+            profiler.draw_overlay(screen)
+            
+            frame_work = time.perf_counter() - now
+            display.present()
+            if not display.vsync:
+                frame_work = time.perf_counter() - now  # present() doesn't wait, so its upscale and flip are work
+            profiler.mark("present")
+            profiler.end_frame()
+            clock.tick(config.max_fps)  # 0 leaves the frame rate uncapped
+        
+        if replay:
+            logger.info(f"Replay ended at step {world.frame} with score {world.score} "
+                f"(recorded {replay.final_score})")
+            break
+        
+        recorder.save(REPLAY_FILE, world.score)
+        logger.info(f"Recorded {recorder.steps} steps to {REPLAY_FILE}")
+        
+        if world.game_over:
+            # Queued, not written: the writer thread commits it while the game-over screen runs
+            duration = time.perf_counter() - run_started
+            scores.record_run(world.score, seed=world.seed, steps=world.frame, duration=duration,
+                              frames=frames, mean_frame_ms=duration * 1000 / max(frames, 1),
+                              worst_frame_ms=worst_frame * 1000, quality_level=quality.level,
+                              width=WIDTH, height=HEIGHT)
+        if not running:
+            break
         
         # Show game over screen and check if we should restart
         if not show_game_over_screen():
             running = False
+    
+    # Dump per-phase frame timings if the profiler was used
+    if profiler.frames:
+        rows = profiler.export_csv('frame_profile.csv')
+        logger.info(f"Wrote {rows} profiled frames to frame_profile.csv")
+    
+    # Entity pool reuse over the session
+    for name, pool in (("obstacle", obstacle_pool), ("spike", spike_pool),
+                       ("power-up", power_up_pool), ("notification", notification_pool)):
+        logger.info(f"{name} pool: {pool.stats()}")
+    logger.info(f"fonts: {fonts.stats()}")  # late_loads counts fonts built after startup
+    
+    # Waits for any run still queued for the score store
+    scores.close()
+    if scores.write_errors:
+        logger.error(f"{scores.write_errors} runs could not be saved to {SCORES_DB}: {scores.last_error}")
+    stop_logging()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    import sys
+    from config import load_config
+    # Flags that change the resolution need run.py, which applies them before the game loads
+    main(config=load_config(argv=sys.argv[1:])) 
\ No newline at end of file
@@ -2,33 +2,159 @@ import pygame
 import random
 import math
 from constants import *
-from utils import apply_bloom_effect
+from utils import to_display_format
+from cache import LRUCache
+from pool import ObjectPool
+from quality import quality
+
+HIGHLIGHT_WIDTH = 20
+
+# Pre-rendered obstacle artwork shared between obstacles of the same shape
+obstacle_bodies = LRUCache(64)
+highlight_strips = LRUCache(32)
+glow_strips = LRUCache(256)
+spike_sprites = LRUCache(128)
+
+SPIKINESS_STEPS = 20  # Spikiness is bucketed to 0.05 steps
+
+def render_obstacle_body(width, height, pattern_type, color=OBSTACLE_COLOR):
+    """Render the static part of an obstacle: gradient, pattern and border"""
+    shadow_color = (max(0, color[0]-70), max(0, color[1]-70), max(0, color[2]-70))
+    obstacle_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    
+    # Base gradient fill
+    for y in range(height):
+        ratio = y / height
+        r = int(color[0] * (1-ratio) + shadow_color[0] * ratio)
+        g = int(color[1] * (1-ratio) + shadow_color[1] * ratio)
+        b = int(color[2] * (1-ratio) + shadow_color[2] * ratio)
+        pygame.draw.line(obstacle_surface, (r, g, b), (0, y), (width, y))
+    
+    # Add pattern based on pattern_type
+    if pattern_type == "stripes":
+        # Diagonal stripes
+        for i in range(-height, width, 15):
+            stripe_color = (shadow_color[0], shadow_color[1], shadow_color[2], 150)
+            pygame.draw.line(obstacle_surface, stripe_color,
+                          (i, 0), (i + height, height), 2)
+    
+    elif pattern_type == "grid":
+        # Grid pattern
+        for x in range(0, width, 10):
+            pygame.draw.line(obstacle_surface, (*shadow_color, 100), 
+                           (x, 0), (x, height), 1)
+        for y in range(0, height, 10):
+            pygame.draw.line(obstacle_surface, (*shadow_color, 100), 
+                           (0, y), (width, y), 1)
+    
+    elif pattern_type == "dots":
+        # Dot pattern
+        for x in range(5, width, 10):
+            for y in range(5, height, 10):
+                pygame.draw.circle(obstacle_surface, (*shadow_color, 150), 
+                                 (x, y), 2)
+    
+    elif pattern_type == "chevron":
+        # Chevron pattern
+        for y in range(0, height, 10):
+            for x in range(0, width, 20):
+                points = [
+                    (x, y),
+                    (x + 5, y - 5),
+                    (x + 10, y),
+                    (x + 15, y - 5),
+                    (x + 20, y)
+                ]
+                pygame.draw.lines(obstacle_surface, (*shadow_color, 150), 
+                                False, points, 1)
+    
+    # Add border with bevel effect
+    pygame.draw.rect(obstacle_surface, (180, 50, 50), (0, 0, width, height), 2)
+    pygame.draw.line(obstacle_surface, (220, 70, 70), (0, 0), (width, 0), 2)  # Top
+    pygame.draw.line(obstacle_surface, (120, 30, 30), (0, height-1), (width, height-1), 2)  # Bottom
+    
+    return to_display_format(obstacle_surface)
+
+def obstacle_body(width, height, pattern_type):
+    key = (width, height, pattern_type)
+    body = obstacle_bodies.get(key)
+    if body is None:
+        body = obstacle_bodies.put(key, render_obstacle_body(width, height, pattern_type))
+    return body
+
+def highlight_strip(height, accent_color):
+    """Vertical shine band, brightest in the middle"""
+    key = (height, accent_color)
+    strip = highlight_strips.get(key)
+    if strip is None:
+        strip = pygame.Surface((HIGHLIGHT_WIDTH, height), pygame.SRCALPHA)
+        for i in range(HIGHLIGHT_WIDTH):
+            # Calculate alpha based on distance from center of highlight
+            dist = abs(i - HIGHLIGHT_WIDTH//2)
+            alpha = 100 * (1 - dist/(HIGHLIGHT_WIDTH//2))
+            pygame.draw.line(strip, (*accent_color, int(alpha)), (i, 0), (i, height))
+        strip = highlight_strips.put(key, to_display_format(strip))
+    return strip
+
+def glow_strip(width, color, glow_val):
+    """Top-edge glow for one step of the pulse"""
+    key = (width, color, glow_val)
+    strip = glow_strips.get(key)
+    if strip is None:
+        glow_color = (min(255, color[0] + glow_val),
+                      min(255, color[1] + glow_val),
+                      min(255, color[2] + glow_val))
+        # Only the lower half of the 10px glow shows, as it used to be blitted at y=-5
+        strip = pygame.Surface((width, 5), pygame.SRCALPHA)
+        for y in range(5):
+            alpha = int(100 * (1 - (y + 5)/10))
+            pygame.draw.line(strip, (*glow_color, alpha), (0, y), (width, y))
+        strip = glow_strips.put(key, to_display_format(strip))
+    return strip
 
 class Obstacle:
-    def __init__(self, x):
-        self.height = random.randint(OBSTACLE_MIN_HEIGHT, OBSTACLE_MAX_HEIGHT)
-        self.width = random.randint(OBSTACLE_WIDTH_MIN, OBSTACLE_WIDTH_MAX)
+    PATTERNS = ["stripes", "grid", "dots", "chevron"]
+    
+    # Colours are the same for every obstacle, so they're worked out once
+    color = (OBSTACLE_COLOR[0], OBSTACLE_COLOR[1], OBSTACLE_COLOR[2])
+    accent_color = (min(255, color[0]+50), 
+                    min(255, color[1]+50), 
+                    min(255, color[2]+50))
+    shadow_color = (max(0, color[0]-70), 
+                    max(0, color[1]-70), 
+                    max(0, color[2]-70))
+    
+    def __init__(self, x, width=None, height=None, pattern_type=None, config=None):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, width, height, pattern_type, config)
+    
+    def reset(self, x, width=None, height=None, pattern_type=None, config=None):
+        """(Re)initialise as a new obstacle at x; pooled obstacles are reused through this
+
+        Size and pattern come from the level generator; any left out are picked at random.
+        """
+        self.config = config or CONFIG
+        metrics = self.config.metrics
+        self.height = height or random.randint(metrics.obstacle_min_height, metrics.obstacle_max_height)
+        self.width = width or random.randint(metrics.obstacle_width_min, metrics.obstacle_width_max)
         self.x = x
-        self.y = HEIGHT - GROUND_HEIGHT - self.height
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.prev_x = x  # Position before the last update, for render interpolation
+        self.y = metrics.height - metrics.ground_height - self.height
+        self.rect.topleft = (self.x, self.y)
+        self.rect.size = (self.width, self.height)
         self.passed = False
-        self.color = (OBSTACLE_COLOR[0], OBSTACLE_COLOR[1], OBSTACLE_COLOR[2])
         self.glow_factor = 0
         self.glow_dir = 1
         
         # Visual enhancements
-        self.pattern_type = random.choice(["stripes", "grid", "dots", "chevron"])
-        self.accent_color = (min(255, self.color[0]+50), 
-                           min(255, self.color[1]+50), 
-                           min(255, self.color[2]+50))
-        self.shadow_color = (max(0, self.color[0]-70), 
-                           max(0, self.color[1]-70), 
-                           max(0, self.color[2]-70))
+        self.pattern_type = pattern_type or random.choice(self.PATTERNS)
         self.highlight_pos = random.random()  # Position of highlight
+        self.body = obstacle_body(self.width, self.height, self.pattern_type)
     
     def update(self, speed=None):
-        # Use provided speed if available, otherwise use constant
-        move_speed = speed if speed is not None else GAME_SPEED
+        # Use provided speed if available, otherwise the configured one
+        move_speed = speed if speed is not None else self.config.metrics.game_speed
+        self.prev_x = self.x
         self.x -= move_speed
         self.rect.x = self.x
         
@@ -42,193 +168,120 @@ class Obstacle:
         if self.highlight_pos > 1:
             self.highlight_pos = 0
     
-    def draw(self, surface):
-        # Create obstacle surface with more detailed visuals
-        obstacle_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        
-        # Base gradient fill
-        for y in range(self.height):
-            ratio = y / self.height
-            r = int(self.color[0] * (1-ratio) + self.shadow_color[0] * ratio)
-            g = int(self.color[1] * (1-ratio) + self.shadow_color[1] * ratio)
-            b = int(self.color[2] * (1-ratio) + self.shadow_color[2] * ratio)
-            pygame.draw.line(obstacle_surface, (r, g, b), (0, y), (self.width, y))
+    def draw(self, surface, alpha=1.0):
+        # alpha blends between the last two simulation steps
+        x = self.prev_x + (self.x - self.prev_x) * alpha
         
-        # Add pattern based on pattern_type
-        if self.pattern_type == "stripes":
-            # Diagonal stripes
-            stripe_count = self.width // 10
-            for i in range(-self.height, self.width, 15):
-                stripe_color = (self.shadow_color[0], self.shadow_color[1], self.shadow_color[2], 150)
-                pygame.draw.line(obstacle_surface, stripe_color,
-                              (i, 0), (i + self.height, self.height), 2)
-        
-        elif self.pattern_type == "grid":
-            # Grid pattern
-            for x in range(0, self.width, 10):
-                pygame.draw.line(obstacle_surface, (*self.shadow_color, 100), 
-                               (x, 0), (x, self.height), 1)
-            for y in range(0, self.height, 10):
-                pygame.draw.line(obstacle_surface, (*self.shadow_color, 100), 
-                               (0, y), (self.width, y), 1)
-        
-        elif self.pattern_type == "dots":
-            # Dot pattern
-            for x in range(5, self.width, 10):
-                for y in range(5, self.height, 10):
-                    pygame.draw.circle(obstacle_surface, (*self.shadow_color, 150), 
-                                     (x, y), 2)
-        
-        elif self.pattern_type == "chevron":
-            # Chevron pattern
-            for y in range(0, self.height, 10):
-                for x in range(0, self.width, 20):
-                    points = [
-                        (x, y),
-                        (x + 5, y - 5),
-                        (x + 10, y),
-                        (x + 15, y - 5),
-                        (x + 20, y)
-                    ]
-                    pygame.draw.lines(obstacle_surface, (*self.shadow_color, 150), 
-                                    False, points, 1)
-        
-        # Add border with bevel effect
-        pygame.draw.rect(obstacle_surface, (180, 50, 50), (0, 0, self.width, self.height), 2)
-        pygame.draw.line(obstacle_surface, (220, 70, 70), (0, 0), (self.width, 0), 2)  # Top
-        pygame.draw.line(obstacle_surface, (120, 30, 30), (0, self.height-1), (self.width, self.height-1), 2)  # Bottom
+        # Static body is pre-rendered; only the highlight and glow change per frame
+        detail = quality.tier.obstacle_detail
+        if detail:
+            surface.blit(self.body, (x, self.y))
+        else:
+            # Lower quality tiers drop the pattern and the moving shine
+            surface.blit(obstacle_body(self.width, self.height, None), (x, self.y))
         
         # Add shine/highlight effect that moves across the obstacle
-        highlight_width = 20
-        highlight_x = int((self.width + highlight_width) * self.highlight_pos) - highlight_width
+        highlight_x = int((self.width + HIGHLIGHT_WIDTH) * self.highlight_pos) - HIGHLIGHT_WIDTH
         
-        if 0 <= highlight_x < self.width:
-            for i in range(highlight_width):
-                # Calculate alpha based on distance from center of highlight
-                dist = abs(i - highlight_width//2)
-                alpha = 100 * (1 - dist/(highlight_width//2))
-                pygame.draw.line(obstacle_surface, (*self.accent_color, int(alpha)), 
-                               (highlight_x + i, 0), (highlight_x + i, self.height))
+        if detail and 0 <= highlight_x < self.width:
+            strip = highlight_strip(self.height, self.accent_color)
+            visible = min(HIGHLIGHT_WIDTH, self.width - highlight_x)
+            surface.blit(strip, (x + highlight_x, self.y), (0, 0, visible, self.height))
         
-        # Apply glow effect to the edges if enabled
-        if ENABLE_BLOOM:
+        # Apply glow effect to the top edge if enabled
+        if self.config.enable_bloom and quality.tier.bloom > 0:
             glow_val = int(70 * self.glow_factor)
-            glow_color = (min(255, self.color[0] + glow_val),
-                         min(255, self.color[1] + glow_val),
-                         min(255, self.color[2] + glow_val), 100)
-            
-            # Top glow
-            glow_rect = pygame.Surface((self.width, 10), pygame.SRCALPHA)
-            for y in range(10):
-                alpha = int(100 * (1 - y/10))
-                pygame.draw.line(glow_rect, (*glow_color[:3], alpha), 
-                               (0, y), (self.width, y))
-            obstacle_surface.blit(glow_rect, (0, -5))
-        
-        # Blit the final obstacle to the screen
-        surface.blit(obstacle_surface, (self.x, self.y))
+            surface.blit(glow_strip(self.width, self.color, glow_val), (x, self.y))
 
 class Spike:
-    def __init__(self, x, y, width, height):
+    color = SPIKE_COLOR
+    
+    def __init__(self, x, y, width, height, config=None):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, width, height, config)
+    
+    def reset(self, x, y, width, height, config=None):
+        """(Re)initialise as a new spike; pooled spikes are reused through this"""
+        self.config = config or CONFIG
         self.x = x
+        self.prev_x = x  # Position before the last update, for render interpolation
         self.y = y
         self.width = width
         self.height = height
-        self.rect = pygame.Rect(x, y, width, height)
+        self.rect.topleft = (x, y)
+        self.rect.size = (width, height)
         self.passed = False  # Add this attribute to track if player passed the spike
-        self.color = SPIKE_COLOR
-        self.spikiness = random.uniform(1.0, 1.5)  # Reduced spikiness for shorter spikes
+        # Reduced spikiness for shorter spikes, quantized so sprites can be shared
+        self.spikiness = round(random.uniform(1.0, 1.5) * SPIKINESS_STEPS) / SPIKINESS_STEPS
+        self.sprite = spike_sprite(self.width, self.height, self.spikiness, self.color)
         
     def update(self, speed=None):
-        # Use provided speed if available, otherwise use constant
-        move_speed = speed if speed is not None else GAME_SPEED
+        # Use provided speed if available, otherwise the configured one
+        move_speed = speed if speed is not None else self.config.metrics.game_speed
+        self.prev_x = self.x
         self.x -= move_speed
         self.rect.x = self.x
         
-    def draw(self, surface):
-        # Enhanced rendering with shorter, more spread out spikes
-        shadow_surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        shadow_color = (self.color[0]//3, self.color[1]//3, self.color[2]//3, 120)
-        
-        # Fewer spikes with more space between them
-        num_spikes = 2 + int(self.width / 30)  # Fewer spikes based on width
-        spike_width = self.width / num_spikes
-        spacing_factor = 0.6  # Only use 60% of the width for actual spikes
+    def draw(self, surface, alpha=1.0):
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        # Teeth, highlights and glow are baked; the sprite's bottom sits on the spike's base
+        surface.blit(self.sprite, (x, self.y + self.height - self.sprite.get_height()))
+
+def render_spike_sprite(width, height, spikiness, color=SPIKE_COLOR):
+    """Bake a spike strip: glow, teeth and highlight lines in one surface"""
+    # Fewer spikes with more space between them
+    num_spikes = 2 + int(width / 30)  # Fewer spikes based on width
+    spike_width = width / num_spikes
+    spacing_factor = 0.6  # Only use 60% of the width for actual spikes
+    
+    spike_top = height * spikiness
+    glow_width = int(spike_width * spacing_factor * 1.2)
+    glow_height = int(spike_top * 1.2)
+    
+    # Teeth and glow rise above the spike's rect, so the sprite is as tall as the glow
+    sprite_height = max(glow_height, int(math.ceil(spike_top)) + 1)
+    sprite = pygame.Surface((int(math.ceil(width)) + 1, sprite_height), pygame.SRCALPHA)
+    base = sprite_height
+    
+    # One glow texture shared by every tooth
+    glow_surf = pygame.Surface((glow_width, glow_height), pygame.SRCALPHA)
+    pygame.draw.polygon(glow_surf, (255, 100, 100, 40), [
+        (0, glow_height),
+        (glow_width, glow_height),
+        (glow_width // 2, 0),
+    ])
+    
+    for i in range(num_spikes):
+        # Calculate spike position with spacing
+        start_pos = i * spike_width + (spike_width * (1 - spacing_factor) / 2)
+        end_pos = (i + spacing_factor) * spike_width
+        mid_pos = (start_pos + end_pos) / 2
         
-        for i in range(num_spikes):
-            # Calculate spike position with spacing
-            start_pos = i * spike_width + (spike_width * (1 - spacing_factor) / 2)
-            end_pos = (i + spacing_factor) * spike_width
-            mid_pos = (start_pos + end_pos) / 2
-            
-            # Draw shadow with more modest height
-            spike_top = self.height * self.spikiness
-            pygame.draw.polygon(shadow_surf, shadow_color, [
-                (start_pos, self.height),  # Bottom left 
-                (end_pos, self.height),    # Bottom right
-                (mid_pos, self.height - spike_top * 0.3),  # Top point, more modest height
-            ])
+        # Draw base glow
+        sprite.blit(glow_surf, (mid_pos - glow_width // 2, base - glow_height))
         
-        # Draw the actual spikes - shorter and more spread out
-        for i in range(num_spikes):
-            # Calculate spike position with spacing
-            start_pos = i * spike_width + (spike_width * (1 - spacing_factor) / 2)
-            end_pos = (i + spacing_factor) * spike_width
-            mid_pos = (start_pos + end_pos) / 2
-            
-            # Draw base glow
-            glow_width = int(spike_width * spacing_factor * 1.2)
-            glow_height = int(self.height * self.spikiness * 1.2)
-            glow_surf = pygame.Surface((glow_width, glow_height), pygame.SRCALPHA)
-            
-            pygame.draw.polygon(glow_surf, (255, 100, 100, 40), [
-                (0, glow_height),
-                (glow_width, glow_height),
-                (glow_width // 2, 0),
-            ])
-            
-            x_pos = self.x + mid_pos - glow_width // 2
-            y_pos = self.y + self.height - glow_height
-            surface.blit(glow_surf, (x_pos, y_pos))
-            
-            # Draw a shorter, sharper spike
-            pygame.draw.polygon(surface, self.color, [
-                (self.x + start_pos, self.y + self.height),       # Bottom left
-                (self.x + end_pos, self.y + self.height),         # Bottom right
-                (self.x + mid_pos, self.y + self.height - (self.height * self.spikiness)), # Lower top point
-            ])
-            
-            # Add highlight line for definition
-            pygame.draw.line(surface, (255, 150, 150), 
-                (self.x + start_pos + 2, self.y + self.height - 1),
-                (self.x + mid_pos, self.y + self.height - (self.height * self.spikiness)),
-                2)
-
-def create_obstacles(num_obstacles=20):
-    obstacles = []
-    spikes = []
-    x = WIDTH  # Start just off screen
-    
-    for _ in range(num_obstacles):
-        # Add more distance between obstacles
-        next_distance = random.randint(MIN_OBSTACLE_DISTANCE + 30, MAX_OBSTACLE_DISTANCE + 50)
+        # Draw a shorter, sharper spike
+        pygame.draw.polygon(sprite, color, [
+            (start_pos, base),           # Bottom left
+            (end_pos, base),             # Bottom right
+            (mid_pos, base - spike_top), # Lower top point
+        ])
         
-        # Randomize obstacle type with some spacing
-        if random.random() < SPIKE_CHANCE:
-            # Create a spike
-            spike_width = random.randint(SPIKE_WIDTH, SPIKE_WIDTH * 2)
-            spike_height = random.randint(SPIKE_HEIGHT, SPIKE_HEIGHT * 3 // 2)
-            
-            # Position spikes at ground level
-            spike_y = HEIGHT - GROUND_HEIGHT - spike_height
-            
-            # Add spike with extra spacing
-            spikes.append(Spike(x + 20, spike_y, spike_width, spike_height))
-            x += spike_width + next_distance + 20  # Extra spacing after spikes
-        else:
-            # Create regular obstacle - only pass x coordinate as the constructor handles the rest
-            obstacle = Obstacle(x)
-            obstacles.append(obstacle)
-            x += obstacle.width + next_distance
+        # Add highlight line for definition
+        pygame.draw.line(sprite, (255, 150, 150), 
+            (start_pos + 2, base - 1),
+            (mid_pos, base - spike_top),
+            2)
     
-    return obstacles, spikes 
\ No newline at end of file
+    return to_display_format(sprite)
+
+def spike_sprite(width, height, spikiness, color=SPIKE_COLOR):
+    key = (width, height, spikiness, color)
+    sprite = spike_sprites.get(key)
+    if sprite is None:
+        sprite = spike_sprites.put(key, render_spike_sprite(width, height, spikiness, color))
+    return sprite
+
+# Obstacles and spikes leaving the screen are recycled for new spawns
+obstacle_pool = ObjectPool(Obstacle)
+spike_pool = ObjectPool(Spike)
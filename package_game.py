@@ -22,7 +22,25 @@ PyInstaller.__main__.run([
     '--add-data=player.py:geodash',
     '--add-data=utils.py:geodash',
     '--add-data=visuals.py:geodash',
+    '--add-data=cache.py:geodash',
+    '--add-data=bloom.py:geodash',
+    '--add-data=text_render.py:geodash',
+    '--add-data=particles.py:geodash',
+    '--add-data=simulation.py:geodash',
+    '--add-data=profiler.py:geodash',
+    '--add-data=assets.py:geodash',
+    '--add-data=entity_index.py:geodash',
+    '--add-data=pool.py:geodash',
+    '--add-data=level.py:geodash',
+    '--add-data=replay.py:geodash',
+    '--add-data=fonts.py:geodash',
+    '--add-data=display.py:geodash',
+    '--add-data=quality.py:geodash',
+    '--add-data=config.py:geodash',
+    '--add-data=scores.py:geodash',
+    '--add-data=logs.py:geodash',
     '--hidden-import=pygame',
+    '--hidden-import=numpy',
     '--clean',
     '--noconfirm',
     '--osx-bundle-identifier=com.yourname.spacerun',
@@ -0,0 +1,269 @@
+import math
+import numpy as np
+import pygame
+from constants import *
+from utils import to_display_format
+from assets import assets
+from quality import quality
+
+# Struct-of-arrays particle pool: every particle attribute lives in a preallocated array
+SHAPES = ["circle", "square", "star"]
+
+# Particle colours indexed by the pool's colour column
+PARTICLE_PALETTE = PARTICLE_COLORS + [
+    (50, 150, 255),  # Blue shield particles
+    (255, 215, 0),   # Gold particles for score
+]
+SHIELD_COLOR_INDEX = len(PARTICLE_COLORS)
+SCORE_COLOR_INDEX = len(PARTICLE_COLORS) + 1
+
+# Emitter presets, carried over from the EnhancedParticle types. Ranges are uniform
+# (lifetime is an inclusive integer range); "color" None picks from PARTICLE_COLORS.
+PARTICLE_PRESETS = {
+    "normal":  {"vx": (-1.5, 1.5), "vy": (-3, -0.5), "lifetime": (15, 30), "size": (1, 4),
+                "gravity": 0.1, "decay_rate": 6, "color": None},
+    "explode": {"vx": (-4, 4), "vy": (-4, 4), "lifetime": (20, 40), "size": (2, 5),
+                "gravity": 0.05, "decay_rate": 6, "color": None},
+    "trail":   {"vx": (-0.5, 0.5), "vy": (-0.3, 0.3), "lifetime": (8, 15), "size": (1, 2),
+                "gravity": 0, "decay_rate": 15, "color": None},
+    "land":    {"vx": (-3, 3), "vy": (-2, 0), "lifetime": (15, 30), "size": (1, 4),
+                "gravity": 0.15, "decay_rate": 8, "color": None},
+    "shield":  {"vx": (-2, 2), "vy": (-2, 2), "lifetime": (20, 40), "size": (2, 4),
+                "gravity": 0, "decay_rate": 6, "color": SHIELD_COLOR_INDEX},
+    "score":   {"vx": (-3, 3), "vy": (-4, -1), "lifetime": (20, 35), "size": (2, 4),
+                "gravity": 0.05, "decay_rate": 7, "color": SCORE_COLOR_INDEX},
+}
+PRESET_NAMES = list(PARTICLE_PRESETS)
+EXPLODE_KIND = PRESET_NAMES.index("explode")
+
+# Atlas quantization
+MIN_VISIBLE_ALPHA = 70  # Nearly-invisible particles are not drawn
+MAX_ALPHA = 200
+ALPHA_LEVELS = 4
+SIZE_STEPS = 2  # Sprite sizes in half-pixel radius steps (size * 2 = sprite width)
+MAX_SIZE = 5
+ROTATION_STEPS = 8  # Per rotational symmetry period of the shape
+SYMMETRY = {"circle": 360, "square": 90, "star": 72}
+
+def _star_points(size):
+    # Simple star shape
+    points = []
+    for i in range(5):
+        # Outer points
+        angle = math.pi * 2 * i / 5 - math.pi / 2
+        points.append((size + math.cos(angle) * size, size + math.sin(angle) * size))
+        # Inner points
+        angle += math.pi / 5
+        points.append((size + math.cos(angle) * (size / 2), size + math.sin(angle) * (size / 2)))
+    return points
+
+def render_particle_sprite(shape, color, size, rotation, alpha):
+    """Render one particle sprite the way EnhancedParticle.draw did"""
+    particle_surf = pygame.Surface((int(size * 2), int(size * 2)), pygame.SRCALPHA)
+    if shape == "circle":
+        pygame.draw.circle(particle_surf, (*color, alpha), (int(size), int(size)), int(size))
+    elif shape == "square":
+        pygame.draw.rect(particle_surf, (*color, alpha), (0, 0, int(size * 2), int(size * 2)))
+    elif shape == "star":
+        pygame.draw.polygon(particle_surf, (*color, alpha), _star_points(size))
+    if rotation != 0 and shape != "circle":
+        particle_surf = pygame.transform.rotate(particle_surf, rotation)
+    return to_display_format(particle_surf)
+
+def render_glow_sprite(color, size, alpha):
+    glow_size = int(size * 3)
+    glow_surf = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
+    pygame.draw.circle(glow_surf, (*color, min(100, alpha // 2)), (glow_size, glow_size), glow_size)
+    return to_display_format(glow_surf)
+
+class ParticleAtlas:
+    """Every (shape, colour, size, rotation, alpha) particle sprite, pre-rendered
+
+    Sprites live in flat lists addressed by a mixed-radix index, so the pool can
+    compute indices for all live particles with array maths.
+    """
+    def __init__(self, palette=PARTICLE_PALETTE):
+        self.palette = palette
+        self.sizes = MAX_SIZE * SIZE_STEPS + 1
+        self.alpha_values = np.linspace(MIN_VISIBLE_ALPHA, MAX_ALPHA, ALPHA_LEVELS).astype(int)
+        self.periods = np.array([SYMMETRY[shape] for shape in SHAPES], np.float32)
+
+        self.sprites = []
+        for shape in SHAPES:
+            for color in palette:
+                for size_index in range(self.sizes):
+                    for step in range(ROTATION_STEPS):
+                        if shape == "circle" and step:
+                            # Circles look the same at any rotation: every step reuses step 0's sprites
+                            self.sprites.extend(self.sprites[-ALPHA_LEVELS:])
+                            continue
+                        rotation = SYMMETRY[shape] * step / ROTATION_STEPS
+                        for alpha in self.alpha_values:
+                            self.sprites.append(render_particle_sprite(
+                                shape, color, size_index / SIZE_STEPS, rotation, int(alpha)))
+        self.glows = []
+        for color in palette:
+            for size_index in range(self.sizes):
+                for alpha in self.alpha_values:
+                    self.glows.append(render_glow_sprite(color, size_index / SIZE_STEPS, int(alpha)))
+
+        # Half extents for centring each sprite on its particle
+        self.sprite_half = np.array([(s.get_width() // 2, s.get_height() // 2) for s in self.sprites], np.int32)
+        self.glow_half = np.array([(s.get_width() // 2, s.get_height() // 2) for s in self.glows], np.int32)
+
+    def quantize(self, size, rotation, alpha, shape):
+        size_index = np.clip(np.rint(size * SIZE_STEPS), 0, self.sizes - 1).astype(np.int32)
+        period = self.periods[shape]
+        step = np.rint((rotation % period) / period * ROTATION_STEPS).astype(np.int32) % ROTATION_STEPS
+        level = np.clip(np.rint((alpha - MIN_VISIBLE_ALPHA) / (MAX_ALPHA - MIN_VISIBLE_ALPHA) * (ALPHA_LEVELS - 1)),
+                        0, ALPHA_LEVELS - 1).astype(np.int32)
+        return size_index, step, level
+
+    def sprite_index(self, shape, color, size_index, step, level):
+        index = shape.astype(np.int32) * len(self.palette) + color
+        index = index * self.sizes + size_index
+        index = index * ROTATION_STEPS + step
+        return index * ALPHA_LEVELS + level
+
+    def glow_index(self, color, size_index, level):
+        return (color.astype(np.int32) * self.sizes + size_index) * ALPHA_LEVELS + level
+
+assets.register("particle_atlas", ParticleAtlas)
+
+def get_particle_atlas():
+    """The shared particle atlas, built on first use (main() preloads it before gameplay)"""
+    return assets.get("particle_atlas")
+
+class ParticlePool:
+    # Per-particle columns and their dtypes
+    FIELDS = {
+        "x": np.float32, "y": np.float32, "vx": np.float32, "vy": np.float32,
+        "gravity": np.float32, "lifetime": np.int32, "alpha": np.float32,
+        "decay_rate": np.float32, "size": np.float32, "rotation": np.float32,
+        "rotation_speed": np.float32, "color": np.int8, "shape": np.int8, "kind": np.int8,
+    }
+
+    def __init__(self, capacity=512, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype))
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, kind="normal", count=1, spread=(0, 0)):
+        """Spawn particles from a preset; spread is a +/- pixel jitter for the origin
+
+        Particles beyond the pool's capacity or the quality tier's budget are dropped.
+        """
+        n = min(count, min(self.capacity, quality.tier.particle_budget) - self.count)
+        if n <= 0:
+            return 0
+        preset = PARTICLE_PRESETS[kind]
+        rng = self.rng
+        live = slice(self.count, self.count + n)
+
+        self.x[live] = x + rng.integers(-spread[0], spread[0] + 1, n)
+        self.y[live] = y + rng.integers(-spread[1], spread[1] + 1, n)
+        self.vx[live] = rng.uniform(*preset["vx"], n)
+        self.vy[live] = rng.uniform(*preset["vy"], n)
+        self.lifetime[live] = rng.integers(preset["lifetime"][0], preset["lifetime"][1] + 1, n)
+        self.size[live] = rng.uniform(*preset["size"], n)
+        self.gravity[live] = preset["gravity"]
+        self.decay_rate[live] = preset["decay_rate"]
+        self.alpha[live] = 200
+        self.rotation[live] = rng.uniform(0, 360, n)
+        self.rotation_speed[live] = rng.uniform(-5, 5, n)
+        if preset["color"] is None:
+            self.color[live] = rng.integers(0, len(PARTICLE_COLORS), n)
+        else:
+            self.color[live] = preset["color"]
+        # 30% of particles get a random shape, the rest are circles
+        shapes = rng.integers(0, len(SHAPES), n)
+        shapes[rng.random(n) <= 0.7] = 0
+        self.shape[live] = shapes
+        self.kind[live] = PRESET_NAMES.index(kind)
+
+        self.count += n
+        return n
+
+    def update(self):
+        """Advance every live particle one frame, then drop the dead ones"""
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.vy[:n] += self.gravity[:n]
+        self.lifetime[:n] -= 1
+        np.maximum(self.alpha[:n] - self.decay_rate[:n], 0, out=self.alpha[:n])
+        np.maximum(self.size[:n] - 0.05, 0, out=self.size[:n])
+        self.rotation[:n] += self.rotation_speed[:n]
+
+        dead = np.flatnonzero(self.lifetime[:n] <= 0)
+        if len(dead):
+            self._remove(dead)
+
+    def _remove(self, dead):
+        # Swap-remove: dead slots below the new count are refilled from live slots above it
+        new_count = self.count - len(dead)
+        holes = dead[dead < new_count]
+        tail_dead = np.zeros(self.count - new_count, bool)
+        tail_dead[dead[dead >= new_count] - new_count] = True
+        fillers = np.flatnonzero(~tail_dead) + new_count
+        for name in self.FIELDS:
+            column = getattr(self, name)
+            column[holes] = column[fillers]
+        self.count = new_count
+
+    def bounds(self):
+        """Rect covering every live particle and its glow, or None when there are none"""
+        n = self.count
+        if n == 0:
+            return None
+        atlas = get_particle_atlas()
+        margin = int(max(atlas.sprite_half.max(), atlas.glow_half.max() if ENABLE_BLOOM else 0)) + 1
+        left, top = int(self.x[:n].min()) - margin, int(self.y[:n].min()) - margin
+        right, bottom = int(self.x[:n].max()) + margin, int(self.y[:n].max()) + margin
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def draw(self, surface):
+        """Draw every visible particle (and its glow) in one batched blits call"""
+        n = self.count
+        visible = np.flatnonzero(self.alpha[:n] >= MIN_VISIBLE_ALPHA)
+        if len(visible) == 0:
+            return
+        atlas = get_particle_atlas()
+        shape = self.shape[visible]
+        color = self.color[visible]
+        size_index, step, level = atlas.quantize(
+            self.size[visible], self.rotation[visible], self.alpha[visible], shape)
+        x = self.x[visible].astype(np.int32)
+        y = self.y[visible].astype(np.int32)
+
+        blits = []
+        bloom = quality.tier.bloom if ENABLE_BLOOM else 0
+        if bloom > 0:
+            # Glow: explode particles always, others flicker with a 30% chance per frame.
+            # Lower quality tiers use a smaller glow sprite, shrinking the radius.
+            glow = (self.kind[visible] == EXPLODE_KIND) | (self.rng.random(len(visible)) > 0.7)
+            glow_size = np.rint(size_index * bloom).astype(np.int32)
+            glow &= glow_size > 0
+            glow_index = atlas.glow_index(color[glow], glow_size[glow], level[glow])
+            glow_pos = np.column_stack((x[glow], y[glow])) - atlas.glow_half[glow_index]
+            glows = atlas.glows
+            blits.extend((glows[g], (int(px), int(py)), None, pygame.BLEND_ADD)
+                         for g, (px, py) in zip(glow_index.tolist(), glow_pos.tolist()))
+
+        drawn = size_index > 0
+        sprite_index = atlas.sprite_index(shape[drawn], color[drawn], size_index[drawn], step[drawn], level[drawn])
+        sprite_pos = np.column_stack((x[drawn], y[drawn])) - atlas.sprite_half[sprite_index]
+        sprites = atlas.sprites
+        blits.extend((sprites[i], pos) for i, pos in zip(sprite_index.tolist(), sprite_pos.tolist()))
+
+        surface.blits(blits, doreturn=False)
@@ -1,20 +1,28 @@
 import pygame
 import random
 from constants import *
-from visuals import EnhancedParticle
-from utils import apply_bloom_effect
+from particles import ParticlePool
+from visuals import player_images
+from quality import quality
 
 class Player:
-    def __init__(self):
-        self.x = int(WIDTH * 0.2)  # Position at 20% of screen width instead of fixed 100px
-        self.y = HEIGHT - GROUND_HEIGHT - PLAYER_SIZE
+    def __init__(self, config=None):
+        self.config = config or CONFIG
+        metrics = self.config.metrics
+        self.size = metrics.player_size
+        self.gravity = metrics.gravity
+        self.jump_strength = metrics.jump_strength
+        self.floor_y = metrics.height - metrics.ground_height - self.size  # Standing on the ground
+        self.x = int(metrics.width * 0.2)  # Position at 20% of screen width instead of fixed 100px
+        self.y = self.floor_y
+        self.prev_y = self.y  # Height before the last update, for render interpolation
         self.velocity = 0
         self.jumping = False
         self.can_double_jump = False
-        self.rect = pygame.Rect(self.x, self.y, PLAYER_SIZE, PLAYER_SIZE)
+        self.rect = pygame.Rect(self.x, self.y, self.size, self.size)
         self.on_obstacle = False
         self.rotation = 0
-        self.particles = []
+        self.particles = ParticlePool(256)
         self.trail = []  # For motion trail
         self.dash_effect_timer = 0
         self.particle_spawn_timer = 0
@@ -26,31 +34,30 @@ class Player:
     
     def jump(self):
         if not self.jumping or self.on_obstacle:
-            self.velocity = -JUMP_STRENGTH
+            self.velocity = -self.jump_strength
             self.jumping = True
             self.can_double_jump = True
             self.on_obstacle = False
             self.dash_effect_timer = 10  # Trigger dash effect
             
             # Create fewer jump particles
-            for _ in range(3):  # Reduced from 8
-                self.particles.append(EnhancedParticle(self.x + PLAYER_SIZE//2, 
-                                                    self.y + PLAYER_SIZE, 
-                                                    "explode"))
+            self.particles.emit(self.x + self.size//2, self.y + self.size, 
+                                "explode", 3)  # Reduced from 8
         elif self.can_double_jump:
-            self.velocity = -JUMP_STRENGTH
+            self.velocity = -self.jump_strength
             self.can_double_jump = False
             self.dash_effect_timer = 15
             
             # Create fewer double jump particles
-            for _ in range(4):  # Reduced from 12
-                self.particles.append(EnhancedParticle(self.x + PLAYER_SIZE//2, 
-                                                    self.y + PLAYER_SIZE//2, 
-                                                    "explode"))
+            self.particles.emit(self.x + self.size//2, self.y + self.size//2, 
+                                "explode", 4)  # Reduced from 12
     
     def update(self, obstacles, spikes):
+        """Advance one step; obstacles and spikes are EntityIndex instances. Returns True on a fatal hit"""
+        self.prev_y = self.y
+        
         # Apply gravity
-        self.velocity += GRAVITY
+        self.velocity += self.gravity
         self.y += self.velocity
         
         # Update glow effect
@@ -66,27 +73,25 @@ class Player:
         if self.particle_spawn_timer <= 0 and abs(self.velocity) > 5:
             self.particle_spawn_timer = 12  # Increased from 6 to 12 (less frequent)
             # Create just a single particle for movement
-            self.particles.append(EnhancedParticle(
-                self.x + random.randint(0, PLAYER_SIZE),
-                self.y + random.randint(0, PLAYER_SIZE),
+            self.particles.emit(
+                self.x + random.randint(0, self.size),
+                self.y + random.randint(0, self.size),
                 "trail"
-            ))
+            )
         
         # Check ground collision
-        if self.y > HEIGHT - GROUND_HEIGHT - PLAYER_SIZE:
-            self.y = HEIGHT - GROUND_HEIGHT - PLAYER_SIZE
+        if self.y > self.floor_y:
+            self.y = self.floor_y
             self.velocity = 0
             self.jumping = False
             self.on_obstacle = False
             
             # Create landing particles
-            for _ in range(2):  # Reduced from typical values
-                self.particles.append(EnhancedParticle(self.x + PLAYER_SIZE//2, 
-                                                    self.y + PLAYER_SIZE, 
-                                                    "land"))
+            self.particles.emit(self.x + self.size//2, self.y + self.size, 
+                                "land", 2)  # Reduced from typical values
         
         # Update rectangle position
-        self.rect = pygame.Rect(self.x, self.y, PLAYER_SIZE, PLAYER_SIZE)
+        self.rect = pygame.Rect(self.x, self.y, self.size, self.size)
         
         # Add trail effect
         if len(self.trail) < 2 and pygame.time.get_ticks() % 10 == 0:  # Changed from 3 and 6 to 2 and 10
@@ -108,24 +113,21 @@ class Player:
             self.dash_effect_timer -= 1
         
         # Update particles
-        for particle in list(self.particles):
-            particle.update()
-            if particle.lifetime <= 0:
-                self.particles.remove(particle)
+        self.particles.update()
+        
+        # Only entities overlapping the player's x-span can touch it
+        left, right = self.rect.left, self.rect.right
         
         # Check for landing on spikes
-        for spike in spikes:
+        for spike in spikes.overlapping(left, right):
             if self.rect.colliderect(spike.rect):
                 # Create collision particles - explosion effect
-                for _ in range(30):
-                    self.particles.append(EnhancedParticle(self.rect.centerx, 
-                                                        self.rect.centery, 
-                                                        "explode"))
+                self.particles.emit(self.rect.centerx, self.rect.centery, "explode", 30)
                 return True  # Collision with spike (game over)
         
         # Check for landing on top of obstacles
         self.on_obstacle = False
-        for obstacle in obstacles:
+        for obstacle in obstacles.overlapping(left, right):
             # Check if player is falling down
             if self.velocity > 0:
                 # Check if player's bottom is at or slightly below obstacle's top
@@ -135,18 +137,16 @@ class Player:
                     self.rect.right > obstacle.rect.left and 
                     self.rect.left < obstacle.rect.right):
                     # Land on the obstacle
-                    self.y = obstacle.rect.top - PLAYER_SIZE
+                    self.y = obstacle.rect.top - self.size
                     self.velocity = 0
                     self.jumping = False
                     self.on_obstacle = True
                     # Update rectangle after position change
-                    self.rect = pygame.Rect(self.x, self.y, PLAYER_SIZE, PLAYER_SIZE)
+                    self.rect = pygame.Rect(self.x, self.y, self.size, self.size)
                     
                     # Create landing particles
-                    for _ in range(12):
-                        self.particles.append(EnhancedParticle(self.x + PLAYER_SIZE//2, 
-                                                            self.y + PLAYER_SIZE, 
-                                                            "land"))
+                    self.particles.emit(self.x + self.size//2, self.y + self.size, 
+                                        "land", 12)
                     break
             
             # Check for side collisions with obstacles (only if not landing on top)
@@ -155,22 +155,25 @@ class Player:
                 not (self.rect.bottom > obstacle.rect.top and 
                      self.rect.bottom < obstacle.rect.top + 10)):
                 # Create collision particles - explosion effect
-                for _ in range(30):
-                    self.particles.append(EnhancedParticle(
-                        (self.rect.left + obstacle.rect.right) // 2,
-                        (self.rect.top + self.rect.bottom) // 2,
-                        "explode"))
+                self.particles.emit(
+                    (self.rect.left + obstacle.rect.right) // 2,
+                    (self.rect.top + self.rect.bottom) // 2,
+                    "explode", 30)
                 return True  # Collision detected (game over)
                 
         return False  # No side collision
     
-    def draw(self, surface):
+    def draw(self, surface, alpha=1.0):
+        # alpha blends between the last two simulation steps
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        center = (self.x + self.size // 2, y + self.size // 2)
+        
         # Draw trail
-        for i, (x, y, alpha) in enumerate(self.trail):
+        for i, (tx, ty, talpha) in enumerate(self.trail):
             size_factor = 0.7 + (i * 0.05)
-            trail_size = int(PLAYER_SIZE * size_factor)
-            trail_rect = pygame.Rect(x - (trail_size - PLAYER_SIZE)//2, 
-                                    y - (trail_size - PLAYER_SIZE)//2,
+            trail_size = int(self.size * size_factor)
+            trail_rect = pygame.Rect(tx - (trail_size - self.size)//2, 
+                                    ty - (trail_size - self.size)//2,
                                     trail_size, trail_size)
             
             # Enhanced trail with color variation
@@ -181,15 +184,16 @@ class Player:
             )
             
             s = pygame.Surface((trail_size, trail_size), pygame.SRCALPHA)
-            s.fill((*trail_color, alpha))
+            s.fill((*trail_color, talpha))
             rotated = pygame.transform.rotate(s, self.rotation)
             surface.blit(rotated, rotated.get_rect(center=trail_rect.center))
         
         # Get player image from visuals module
-        from visuals import player_img, player_glow
+        player_img, player_glow = player_images()
         
-        # Draw glow effect if enabled
-        if ENABLE_BLOOM:
+        # Draw glow effect if enabled and the quality tier keeps glows
+        bloom = quality.tier.bloom if self.config.enable_bloom else 0
+        if bloom > 0:
             # Adjust glow size based on pulsing factor but make it smaller
             glow_size = (
                 int(player_glow.get_width() * (0.7 + 0.15 * self.glow_factor)),  # Reduced from 0.8+0.2
@@ -201,11 +205,11 @@ class Player:
             rotated_glow = pygame.transform.rotate(glow, self.rotation)
             
             # Position glow (centered on player)
-            glow_rect = rotated_glow.get_rect(center=self.rect.center)
+            glow_rect = rotated_glow.get_rect(center=center)
             surface.blit(rotated_glow, glow_rect)
             
-            # Add extra glow for dash effect
-            if self.dash_effect_timer > 0:
+            # Add extra glow for dash effect (full-quality glow only)
+            if self.dash_effect_timer > 0 and bloom >= 1:
                 dash_factor = self.dash_effect_timer / 15
                 dash_glow = pygame.transform.scale(
                     player_glow, 
@@ -214,23 +218,22 @@ class Player:
                 )
                 dash_glow = pygame.transform.rotate(dash_glow, self.rotation)
                 dash_glow.set_alpha(int(120 * dash_factor))  # Reduced from 150
-                dash_rect = dash_glow.get_rect(center=self.rect.center)
+                dash_rect = dash_glow.get_rect(center=center)
                 surface.blit(dash_glow, dash_rect)
         
         # Draw player
         rotated_player = pygame.transform.rotate(player_img, self.rotation)
-        player_rect = rotated_player.get_rect(center=self.rect.center)
+        player_rect = rotated_player.get_rect(center=center)
         surface.blit(rotated_player, player_rect)
         
         # Draw particles
-        for particle in self.particles:
-            particle.draw(surface)
+        self.particles.draw(surface)
             
         # Add a "speed line" effect when moving fast
         if abs(self.velocity) > 5 and pygame.time.get_ticks() % 3 == 0:
             for i in range(3):  # Multiple speed lines
-                line_y = self.y + random.randint(0, PLAYER_SIZE)
-                line_length = random.randint(PLAYER_SIZE, PLAYER_SIZE*2)
+                line_y = y + random.randint(0, self.size)
+                line_length = random.randint(self.size, self.size*2)
                 line_thickness = random.randint(1, 3)
                 
                 speed_line = pygame.Surface((line_length, line_thickness), pygame.SRCALPHA)
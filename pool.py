@@ -0,0 +1,37 @@
+# Free-list object pool for entities that are spawned and dropped continuously
+class ObjectPool:
+    """Recycles released objects through their reset() method instead of building new ones
+
+    acquire(*args) calls reset(*args) on a free object, or cls(*args) when none is free,
+    so a pooled class takes the same arguments in both.
+    """
+    def __init__(self, cls, maxsize=64):
+        self.cls = cls
+        self.maxsize = maxsize
+        self._free = []
+        self.in_use = 0
+        self.hits = 0
+        self.misses = 0
+        self.high_water = 0  # Most objects out of the pool at once
+
+    def acquire(self, *args, **kwargs):
+        if self._free:
+            obj = self._free.pop()
+            obj.reset(*args, **kwargs)
+            self.hits += 1
+        else:
+            obj = self.cls(*args, **kwargs)
+            self.misses += 1
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return obj
+
+    def release(self, obj):
+        """Hand an object back; it must no longer be referenced by the game"""
+        self.in_use -= 1
+        if len(self._free) < self.maxsize:
+            self._free.append(obj)
+
+    def stats(self):
+        return {"free": len(self._free), "in_use": self.in_use, "hits": self.hits,
+                "misses": self.misses, "high_water": self.high_water}
@@ -0,0 +1,104 @@
+import csv
+import time
+import numpy as np
+import pygame
+from fonts import fonts
+
+# Frame phases, in the order they run in the main loop
+PHASES = [
+    "input", "spawn", "obstacles", "collision", "particle_update",
+    "background", "ground", "entities", "particles", "hud", "present",
+]
+
+class FrameProfiler:
+    """Per-phase frame timer backed by a fixed-size ring buffer
+
+    Each mark(phase) attributes the time since the previous mark to that phase.
+    When disabled every call returns immediately, so it can stay in the loop.
+    """
+    def __init__(self, phases=PHASES, capacity=600):
+        self.phases = list(phases)
+        self.capacity = capacity
+        self.enabled = False
+        self._index = {phase: i for i, phase in enumerate(self.phases)}
+        # One row per frame: a column per phase plus the frame total, in seconds
+        self.samples = np.zeros((capacity, len(self.phases) + 1))
+        self.frames = 0
+        self._current = [0.0] * len(self.phases)
+        self._frame_start = 0.0
+        self._last = 0.0
+
+        self._overlay = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self._overlay = None
+        if self.enabled:
+            self.begin_frame()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._current[self._index[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        row = self.samples[self.frames % self.capacity]
+        row[:-1] = self._current
+        row[-1] = time.perf_counter() - self._frame_start
+        self._current = [0.0] * len(self.phases)
+        self.frames += 1
+
+    def recorded(self):
+        """Recorded rows, oldest first"""
+        if self.frames <= self.capacity:
+            return self.samples[:self.frames]
+        start = self.frames % self.capacity
+        return np.concatenate((self.samples[start:], self.samples[:start]))
+
+    def summary(self):
+        """(phase, mean ms, worst ms) for each phase and the whole frame"""
+        rows = self.recorded()
+        if len(rows) == 0:
+            return []
+        means = rows.mean(axis=0) * 1000
+        worst = rows.max(axis=0) * 1000
+        return list(zip(self.phases + ["frame"], means, worst))
+
+    def draw_overlay(self, surface, position=(10, 10), refresh_every=30):
+        """Draw rolling averages and worst frames; the text is re-rendered every few frames"""
+        if not self.enabled:
+            return
+        if self._overlay is None or self.frames % refresh_every == 0:
+            font = fonts["profiler"]
+            lines = [f"{'phase':<16}{'avg ms':>8}{'worst':>8}"]
+            lines += [f"{phase:<16}{mean:>8.2f}{worst:>8.2f}" for phase, mean, worst in self.summary()]
+            line_height = font.get_linesize()
+            width = max(font.size(line)[0] for line in lines) + 12
+            self._overlay = pygame.Surface((width, line_height * len(lines) + 12), pygame.SRCALPHA)
+            self._overlay.fill((0, 0, 0, 170))
+            for i, line in enumerate(lines):
+                self._overlay.blit(font.render(line, True, (200, 255, 200)),
+                                   (6, 6 + i * line_height))
+        surface.blit(self._overlay, position)
+
+    def export_csv(self, path):
+        """Write recorded frames to CSV (milliseconds); returns the number of rows"""
+        rows = self.recorded()
+        if len(rows) == 0:
+            return 0
+        first_frame = self.frames - len(rows)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + [f"{phase}_ms" for phase in self.phases] + ["frame_ms"])
+            for i, row in enumerate(rows):
+                writer.writerow([first_frame + i] + [f"{value * 1000:.4f}" for value in row])
+        return len(rows)
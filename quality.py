@@ -0,0 +1,103 @@
+from collections import deque, namedtuple
+from constants import *
+
+# One step on the quality ladder. bloom scales glow radii (0 turns glows off),
+# particle_budget caps live particles, parallax_layers is how many star layers
+# scroll, obstacle_detail draws patterns and the moving shine, filtered_upscale
+# allows smoothscale when the frame is upscaled in software.
+QualityTier = namedtuple("QualityTier", ["name", "bloom", "particle_budget", "parallax_layers",
+                                         "obstacle_detail", "filtered_upscale"])
+
+# Best first; each tier gives up one more thing than the last
+QUALITY_TIERS = [
+    QualityTier("full", 1.0, 512, 2, True, True),
+    QualityTier("soft glow", 0.5, 512, 2, True, True),
+    QualityTier("no glow", 0.0, 512, 2, True, True),
+    QualityTier("fewer particles", 0.0, 128, 2, True, True),
+    QualityTier("flat background", 0.0, 128, 0, True, True),
+    QualityTier("plain obstacles", 0.0, 128, 0, False, True),
+]
+# Only a saving when the upscale is filtered in the first place (render_smooth)
+UNFILTERED_TIER = QualityTier("unfiltered upscale", 0.0, 128, 0, False, False)
+
+def quality_tiers(smooth_upscale=RENDER_SMOOTH):
+    """The tiers to step through for a display that does or doesn't filter its upscale"""
+    return QUALITY_TIERS + [UNFILTERED_TIER] if smooth_upscale else list(QUALITY_TIERS)
+
+class QualityGovernor:
+    """Steps the quality tier down when frames run over budget and back up with headroom
+
+    record() takes each frame's interval (start to start, including any vsync
+    wait) and its work time (everything but waiting for vsync or the frame
+    cap). Both directions go by the work: the interval of a vsynced frame is
+    the refresh period however light the frame, so on a 30 or 50 Hz display it
+    would always look over budget. A full window whose average work is near
+    the budget steps down one tier. Stepping up needs a full window of work
+    well under the budget and a longer hold since the last change, so a tier
+    that only just fits isn't retried every second; each step up that has to
+    be undone doubles that hold.
+    """
+    def __init__(self, tiers=None, target_fps=QUALITY_TARGET_FPS, window=QUALITY_WINDOW):
+        self.tiers = tiers or quality_tiers()
+        self.budget = 1.0 / target_fps
+        self.intervals = deque(maxlen=window)
+        self.work = deque(maxlen=window)
+        self.enabled = ADAPTIVE_QUALITY
+        self.level = 0
+        self.frames_since_change = 0
+        self.changes = 0
+        self.up_hold = QUALITY_UP_HOLD
+        self._last_step = 0
+        self.measured = (0.0, 0.0)  # Window averages behind the last decision, for logging
+
+    @property
+    def tier(self):
+        return self.tiers[self.level]
+
+    @property
+    def lowest(self):
+        return self.level == len(self.tiers) - 1
+
+    def reset(self):
+        """Forget the measured frames, e.g. after a menu or loading pause; the tier is kept"""
+        self.intervals.clear()
+        self.work.clear()
+        self.frames_since_change = 0
+
+    def set_level(self, level):
+        level = max(0, min(level, len(self.tiers) - 1))
+        if level > self.level and self._last_step < 0:
+            # The last step up didn't hold; wait longer before trying it again
+            self.up_hold = min(self.up_hold * 2, QUALITY_UP_HOLD * 8)
+        self._last_step = level - self.level
+        self.level = level
+        self.changes += 1
+        self.reset()
+
+    def average(self):
+        """(mean interval, mean work time) over the window, in seconds"""
+        if not self.intervals:
+            return 0.0, 0.0
+        return sum(self.intervals) / len(self.intervals), sum(self.work) / len(self.work)
+
+    def record(self, interval, work):
+        """Add one frame's timings; returns True when the tier changed"""
+        if not self.enabled:
+            return False
+        self.intervals.append(interval)
+        self.work.append(work)
+        self.frames_since_change += 1
+        if len(self.intervals) < self.intervals.maxlen:
+            return False
+
+        _, mean_work = self.measured = self.average()
+        if mean_work > self.budget * QUALITY_DOWN_RATIO and not self.lowest:
+            self.set_level(self.level + 1)
+            return True
+        if (self.level > 0 and self.frames_since_change >= self.up_hold
+                and mean_work < self.budget * QUALITY_UP_RATIO):
+            self.set_level(self.level - 1)
+            return True
+        return False
+
+quality = QualityGovernor()
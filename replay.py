@@ -0,0 +1,173 @@
+"""
+Input recording and deterministic replay
+
+A run is fully determined by its level seed, the resolution (every size scales
+with it), the gameplay settings and the jump input of each simulation step, so
+that is all a replay stores. The settings are a small JSON object after the
+header. Each step's input is two bits; consecutive identical steps - mostly
+idle ones - are run-length encoded into one byte per run of up to 64 steps.
+
+    python replay.py last_run.replay              # headless, as fast as possible
+    python replay.py last_run.replay --profile    # ... with per-phase timings
+    python replay.py last_run.replay --render     # in a window, in real time
+"""
+import os
+import sys
+import json
+import time
+import struct
+
+MAGIC = b"SRRP"
+FORMAT_VERSION = 2  # 1 had no settings; those files still load and play under the defaults
+# magic, version, seed, simulation rate, width, height, steps, final score
+HEADER = struct.Struct("<4sBQHHHII")
+SETTINGS_SIZE = struct.Struct("<H")  # Length of the JSON settings that follow the header
+MAX_RUN = 64  # Steps per RLE byte: two state bits, six length bits
+
+def _state(inputs):
+    return int(bool(inputs.jump_pressed)) | int(bool(inputs.jump_held)) << 1
+
+class InputRecorder:
+    """Collects one run's per-step input as (state, count) runs"""
+    def __init__(self, seed, rate, resolution, settings=None):
+        self.seed = seed
+        self.rate = rate
+        self.resolution = resolution
+        self.settings = settings or {}  # Gameplay settings, see gameplay_settings()
+        self.steps = 0
+        self._runs = []
+
+    def record(self, inputs):
+        state = _state(inputs)
+        if self._runs and self._runs[-1][0] == state:
+            self._runs[-1][1] += 1
+        else:
+            self._runs.append([state, 1])
+        self.steps += 1
+
+    def to_bytes(self, final_score=0):
+        body = bytearray()
+        for state, count in self._runs:
+            while count > 0:
+                run = min(count, MAX_RUN)
+                body.append(state << 6 | (run - 1))
+                count -= run
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, self.seed, self.rate,
+                             self.resolution[0], self.resolution[1], self.steps, final_score)
+        settings = json.dumps(self.settings, separators=(",", ":")).encode()
+        return header + SETTINGS_SIZE.pack(len(settings)) + settings + bytes(body)
+
+    def save(self, path, final_score=0):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes(final_score))
+
+class Replay:
+    """A decoded recording; inputs() yields a FrameInput per simulation step"""
+    def __init__(self, seed, rate, resolution, steps, final_score, runs, settings=None):
+        self.seed = seed
+        self.rate = rate
+        self.resolution = resolution
+        self.steps = steps
+        self.final_score = final_score
+        self.runs = runs
+        self.settings = settings or {}
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, rate, width, height, steps, final_score = HEADER.unpack_from(data)
+        if magic != MAGIC or version not in (1, FORMAT_VERSION):
+            raise ValueError("not a Space Run replay, or from an incompatible version")
+        offset = HEADER.size
+        settings = {}
+        if version >= 2:
+            size, = SETTINGS_SIZE.unpack_from(data, offset)
+            offset += SETTINGS_SIZE.size
+            settings = json.loads(data[offset:offset + size])
+            offset += size
+        runs = [(byte >> 6, (byte & 0x3F) + 1) for byte in data[offset:]]
+        return cls(seed, rate, (width, height), steps, final_score, runs, settings)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def config(self, base=None):
+        """base (the process config by default) with the recorded rate, resolution and gameplay settings"""
+        from config import default_config
+        return (base or default_config()).with_overrides(
+            simulation_rate=self.rate, width=self.resolution[0], height=self.resolution[1], **self.settings)
+
+    def inputs(self):
+        from simulation import FrameInput
+        states = [FrameInput(bool(state & 1), bool(state & 2)) for state in range(4)]
+        for state, count in self.runs:
+            inputs = states[state]
+            for _ in range(count):
+                yield inputs
+
+def gameplay_settings(config):
+    """The settings of config a replay has to be played back under"""
+    from config import GAMEPLAY_FIELDS
+    return {name: getattr(config, name) for name in GAMEPLAY_FIELDS}
+
+def use_recorded_config(replay):
+    """Make the next constants import match the recording; must run before it"""
+    from config import set_default_config
+    if "constants" in sys.modules:
+        raise RuntimeError("constants is already imported; the replay settings can't be applied")
+    set_default_config(replay.config())
+
+def run_headless(replay, profiler=None):
+    """Step through the whole replay without a display; returns (world, seconds)"""
+    from simulation import GameSimulation
+
+    world = GameSimulation(profiler, seed=replay.seed, config=replay.config())
+    start = time.perf_counter()
+    for inputs in replay.inputs():
+        if world.game_over:
+            break
+        if profiler:
+            profiler.begin_frame()
+        world.step(inputs)
+        if profiler:
+            profiler.end_frame()
+    return world, time.perf_counter() - start
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Play back a Space Run recording")
+    parser.add_argument("path")
+    parser.add_argument("--render", action="store_true", help="Play in a window in real time")
+    parser.add_argument("--profile", action="store_true", help="Print per-phase step timings")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    use_recorded_config(replay)
+    if args.render:
+        import main as game
+        game.main(replay=replay)
+        return
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from profiler import FrameProfiler
+
+    profiler = None
+    if args.profile:
+        profiler = FrameProfiler(capacity=max(1, replay.steps))
+        profiler.toggle()
+    world, elapsed = run_headless(replay, profiler)
+
+    print(f"seed {replay.seed}, {replay.resolution[0]}x{replay.resolution[1]}, "
+          f"{world.frame}/{replay.steps} steps in {elapsed:.3f}s ({world.frame / max(elapsed, 1e-9):.0f} steps/s)")
+    status = "matches" if world.score == replay.final_score else "DIFFERS FROM"
+    print(f"final score {world.score} {status} the recorded {replay.final_score}")
+    if profiler:
+        for phase, mean, worst in profiler.summary():
+            if mean or worst:
+                print(f"{phase:<16}{mean:>8.3f} ms{worst:>8.3f} ms worst")
+    if world.score != replay.final_score:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
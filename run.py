@@ -9,6 +9,10 @@ import pygame
 import os
 import platform
 import sys
+from config import load_config, set_default_config
+
+# Settings flags (python run.py --help) have to be in place before the game modules load
+set_default_config(load_config(argv=sys.argv[1:]))
 from main import main
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+"""
+Local leaderboard
+
+Every finished run is stored in a SQLite database in WAL mode. Writes go
+through a queue to a background thread with its own connection, so the game
+never waits on the disk; reads use the caller's connection and, thanks to
+WAL, don't wait for a write in progress either.
+
+    python scores.py            # top 10 runs
+    python scores.py 25         # top 25
+"""
+import os
+import sys
+import json
+import time
+import queue
+import getpass
+import logging
+import sqlite3
+import threading
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    seed INTEGER,
+    steps INTEGER,
+    duration REAL,
+    frames INTEGER,
+    mean_frame_ms REAL,
+    worst_frame_ms REAL,
+    quality_level INTEGER,
+    width INTEGER,
+    height INTEGER,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_player_score ON runs (player, score DESC);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+logger = logging.getLogger(__name__)
+RUN_FIELDS = ("player", "score", "seed", "steps", "duration", "frames", "mean_frame_ms",
+              "worst_frame_ms", "quality_level", "width", "height", "played_at")
+
+def default_player():
+    try:
+        return getpass.getuser()
+    except Exception:  # No login name available (some containers and services)
+        return "player"
+
+def connect(path):
+    connection = sqlite3.connect(path, timeout=5)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")  # Durable at each checkpoint; commits stay atomic
+    return connection
+
+class ScoreStore:
+    """Run history with indexed leaderboard queries and background writes
+
+    record_run() only queues the row; the writer thread commits each run in its
+    own transaction. flush() waits for queued runs, close() flushes and stops
+    the thread. Failed writes are counted in write_errors.
+    """
+    def __init__(self, path, player=None, legacy_file=None):
+        self.path = path
+        self.player = player or default_player()
+        self.write_errors = 0
+        self.last_error = None
+        self._db = connect(path)
+        with self._db:
+            self._db.executescript(SCHEMA)
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        if legacy_file:
+            self._migrate_high_score(legacy_file)
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="score-writer", daemon=True)
+        self._writer.start()
+
+    def _migrate_high_score(self, legacy_file):
+        # The old single-number high score becomes one run, the first time only
+        if self._db.execute("SELECT 1 FROM meta WHERE key = 'migrated_high_score'").fetchone():
+            return
+        score = 0
+        try:
+            with open(legacy_file) as f:
+                score = int(json.load(f).get("high_score") or 0)
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass  # Missing or malformed (null, a list, not a number): nothing to import
+        with self._db:
+            if score > 0:
+                self._db.execute("INSERT INTO runs (player, score, played_at) VALUES (?, ?, ?)",
+                                 (self.player, score, os.path.getmtime(legacy_file)))
+            self._db.execute("INSERT INTO meta VALUES ('migrated_high_score', ?)", (str(score),))
+
+    def _write_loop(self):
+        db = connect(self.path)
+        placeholders = ", ".join("?" * len(RUN_FIELDS))
+        insert = f"INSERT INTO runs ({', '.join(RUN_FIELDS)}) VALUES ({placeholders})"
+        while True:
+            run = self._queue.get()
+            try:
+                if run is None:
+                    break
+                with db:
+                    db.execute(insert, [run.get(field) for field in RUN_FIELDS])
+            except sqlite3.Error as error:
+                self.write_errors += 1
+                self.last_error = error
+                logger.error(f"Could not save run with score {run['score']}: {error}")
+            finally:
+                self._queue.task_done()
+        db.close()
+
+    def record_run(self, score, **stats):
+        """Queue a finished run; stats are any other RUN_FIELDS (seed, steps, duration, ...)"""
+        unknown = set(stats) - set(RUN_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown run fields: {', '.join(sorted(unknown))}")
+        run = dict(stats, score=score)
+        run.setdefault("player", self.player)
+        run.setdefault("played_at", time.time())
+        self._queue.put(run)
+
+    def flush(self):
+        """Block until every queued run is written"""
+        self._queue.join()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._db.close()
+
+    def top(self, n=10):
+        """The n best runs as dicts, best first"""
+        cursor = self._db.execute(
+            f"SELECT {', '.join(RUN_FIELDS)} FROM runs ORDER BY score DESC, id LIMIT ?", (n,))
+        return [dict(zip(RUN_FIELDS, row)) for row in cursor]
+
+    def personal_best(self, player=None):
+        """Highest score for a player (this store's by default), 0 before any run"""
+        row = self._db.execute("SELECT MAX(score) FROM runs WHERE player = ?",
+                               (player or self.player,)).fetchone()
+        return row[0] or 0
+
+    def best(self):
+        """Highest score by anyone, 0 before any run"""
+        return self._db.execute("SELECT MAX(score) FROM runs").fetchone()[0] or 0
+
+if __name__ == "__main__":
+    from constants import SCORES_DB
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    store = ScoreStore(SCORES_DB)
+    for rank, run in enumerate(store.top(count), 1):
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(run["played_at"]))
+        seed = "" if run["seed"] is None else f"seed {run['seed']}"
+        print(f"{rank:>3}. {run['score']:>6}  {run['player']:<12} {when}  {seed}")
+    store.close()
@@ -15,7 +15,12 @@ high_score_path = os.path.join(current_dir, 'high_score.json')
 # Python modules in the root directory
 python_modules = [
     'constants.py', 'main.py', 'obstacles.py', 
-    'player.py', 'utils.py', 'visuals.py'
+    'player.py', 'utils.py', 'visuals.py',
+    'cache.py', 'bloom.py', 'text_render.py', 'particles.py',
+    'simulation.py', 'profiler.py', 'assets.py',
+    'entity_index.py', 'pool.py', 'level.py', 'replay.py',
+    'fonts.py', 'display.py', 'quality.py', 'config.py',
+    'scores.py', 'logs.py'
 ]
 
 DATA_FILES = [
@@ -25,7 +30,7 @@ DATA_FILES = [
 
 OPTIONS = {
     'argv_emulation': True,
-    'packages': ['pygame'],
+    'packages': ['pygame', 'numpy'],
     # Absolute minimal configuration
     'plist': {
         'CFBundleName': 'Space Run',
@@ -0,0 +1,272 @@
+import os
+import random
+from collections import namedtuple, deque
+
+if __name__ == "__main__":
+    # Headless runs need no window
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from constants import *
+from player import Player
+from obstacles import obstacle_pool, spike_pool
+from visuals import power_up_pool
+from particles import ParticlePool
+from profiler import FrameProfiler
+from entity_index import EntityIndex
+from level import LevelGenerator
+
+# Per-frame player input: a jump key went down this frame / a jump key is held
+FrameInput = namedtuple("FrameInput", ["jump_pressed", "jump_held"])
+NO_INPUT = FrameInput(False, False)
+
+class GameSimulation:
+    """Game state and rules for one run, with no display or event-queue dependency
+
+    step() advances one fixed step of 1 / config.simulation_rate seconds. Things the front
+    end should react to (notifications, screen shake) are queued in self.events as
+    tuples and cleared on the next step. An optional FrameProfiler receives the
+    spawn/update/collision phase marks. Level content and ambient effects come from
+    seeded generators, so the same seed, config and inputs replay the same run.
+    Without a config the process-wide one from constants is used.
+    """
+    def __init__(self, profiler=None, seed=None, config=None):
+        self.config = config or CONFIG
+        if seed is None:
+            seed = self.config.level_seed
+        self.level = LevelGenerator(seed, config=self.config)
+        self.seed = self.level.seed
+        self.rng = random.Random(f"{self.seed}:ambient")
+        self.distance = 0  # How far the level has scrolled
+        self.pending = deque()  # Generated level slots not yet turned into entities
+        
+        self.player = Player(self.config)
+        # Each kind is indexed by x for broad-phase collision and cheap expiry
+        self.obstacles = EntityIndex(pool=obstacle_pool)
+        self.spikes = EntityIndex(pool=spike_pool)
+        self.power_ups = EntityIndex(pool=power_up_pool)
+        self.particles = ParticlePool(1024)
+        self.score = 0
+        self.lives = 3
+        self.game_over = False
+        self.invincibility_timer = 0  # For temporary invincibility after hit
+        self.active_powerups = []  # Track active power-ups with their timers
+        self.normal_game_speed = self.config.metrics.game_speed
+        self.current_game_speed = self.normal_game_speed
+        self.frame = 0
+        self.events = []
+        self.profiler = profiler or FrameProfiler()
+        
+        # Build everything up to the lookahead horizon before the first step
+        while self._spawn():
+            pass
+
+    def close(self):
+        """Return this run's entities to their pools so the next run can reuse them"""
+        self.obstacles.clear()
+        self.spikes.clear()
+        self.power_ups.clear()
+    
+    def notify(self, text, color, size="medium"):
+        self.events.append(("notify", text, color, size))
+
+    def step(self, inputs=NO_INPUT):
+        self.events = []
+        self.frame += 1
+        player = self.player
+        profiler = self.profiler
+
+        # A key press and a held key each trigger a jump, as in the original loop
+        if inputs.jump_pressed:
+            player.jump()
+        if inputs.jump_held:
+            player.jump()
+
+        # Update invincibility timer
+        if self.invincibility_timer > 0:
+            self.invincibility_timer -= 1
+
+        # Remove obstacles/spikes that have moved off-screen
+        self.obstacles.expire()
+        self.spikes.expire()
+        self.power_ups.expire()
+
+        self._spawn()
+        profiler.mark("spawn")
+        self._move_entities()
+        self._collect_power_ups()
+        profiler.mark("obstacles")
+
+        # Check for collisions
+        collision = player.update(self.obstacles, self.spikes)
+        profiler.mark("collision")
+        if collision and self.invincibility_timer <= 0:
+            self.lives -= 1
+            if self.lives <= 0:
+                self.game_over = True
+                self.events.append(("shake", 10, 20))
+            else:
+                # Player still has lives, show notification with remaining lives
+                life_text = f"{self.lives} {'Lives' if self.lives > 1 else 'Life'} Remaining"
+                self.notify(life_text, (255, 50, 50), size="large")
+
+                # Create an impactful visual effect
+                self.particles.emit(player.rect.centerx, player.rect.centery, "explode", 15)
+
+                # Player still has lives
+                self.invincibility_timer = 120  # 2 seconds of invincibility
+                self.events.append(("shake", 5, 10))  # Smaller screen shake for hit
+
+        # Generate occasional background particles (reduced frequency)
+        metrics = self.config.metrics
+        if self.rng.random() < self.config.particle_frequency:
+            self.particles.emit(self.rng.randint(0, metrics.width),
+                                self.rng.randint(0, metrics.height - metrics.ground_height),
+                                "trail")
+        self.particles.update()
+
+        self._update_active_powerups()
+        profiler.mark("particle_update")
+
+    def _spawn(self):
+        """Build the next level slot once it is within the lookahead; returns True if one was built"""
+        # Entities are built up to a screen width past the right edge before they scroll in
+        horizon = self.distance + self.config.metrics.width * 2
+        
+        # Keep at least a chunk queued past the horizon so generation never falls behind
+        if not self.pending or self.pending[-1].x < horizon:
+            self.pending.extend(self.level.next_chunk())
+        
+        # At most one entity per step: slots are far enough apart that this keeps up
+        if self.pending[0].x >= horizon:
+            return False
+        slot = self.pending.popleft()
+        x = slot.x - self.distance
+        if slot.kind == "obstacle":
+            self.obstacles.add(obstacle_pool.acquire(x, slot.width, slot.height, slot.variant,
+                                                     config=self.config))
+        elif slot.kind == "spike":
+            self.spikes.add(spike_pool.acquire(x, slot.y, slot.width, slot.height, config=self.config))
+        else:
+            self.power_ups.add(power_up_pool.acquire(x, slot.y, slot.variant, config=self.config))
+        return True
+
+    def _move_entities(self):
+        player_x = self.player.x
+        self.distance += self.current_game_speed
+
+        for obstacle in self.obstacles:
+            obstacle.update(self.current_game_speed)
+
+            # Add score when passing
+            if not obstacle.passed and obstacle.x + obstacle.width < player_x:
+                obstacle.passed = True
+                self.score += 1
+
+        for spike in self.spikes:
+            spike.update(self.current_game_speed)
+
+            # Add score when passing
+            if not spike.passed and spike.x + spike.width < player_x:
+                spike.passed = True
+                self.score += 1
+
+    def _collect_power_ups(self):
+        player = self.player
+        for power_up in list(self.power_ups):
+            power_up.update(self.current_game_speed)
+
+            # Check for power-up collection
+            if not player.rect.colliderect(power_up.rect):
+                continue
+            self.power_ups.remove(power_up)
+            center = (player.rect.centerx, player.rect.centery)
+
+            # Apply power-up effect
+            if power_up.type == "extra_life":
+                old_lives = self.lives
+                self.lives = min(self.lives + 1, 5)  # Maximum 5 lives
+
+                # Only show notification if player actually gained a life
+                if self.lives > old_lives:
+                    self.notify("Extra Life!", (255, 50, 50))
+
+                # Add special effect for life gain
+                self.particles.emit(*center, "trail", 20)
+
+            elif power_up.type == "shield":
+                self.invincibility_timer = 300  # 5 seconds at 60 FPS
+                self.notify("Shield Activated!", (50, 100, 255))
+
+                # Add to active power-ups
+                self.active_powerups.append({
+                    "type": "shield",
+                    "timer": self.invincibility_timer,
+                    "icon": "🛡️",
+                    "color": (50, 100, 255)
+                })
+
+                # Add shield effect particles
+                self.particles.emit(*center, "shield", 30)
+
+            elif power_up.type == "score_boost":
+                self.score += 10
+                self.notify("+10 Points!", (255, 215, 0))
+
+                # Add score boost effect
+                self.particles.emit(*center, "score", 15)
+
+            elif power_up.type == "slow_time":
+                self.notify("Time Slowed!", (180, 180, 255))
+
+                # Slow game speed to 50% of normal
+                self.current_game_speed = self.normal_game_speed * 0.5
+
+                # Add to active power-ups list
+                self.active_powerups.append({
+                    "type": "slow_time",
+                    "timer": 300,  # 5 seconds
+                    "icon": "⏱️",
+                    "color": (180, 180, 255),
+                    "original_speed": self.normal_game_speed
+                })
+
+                # Add time slowing effect particles
+                self.particles.emit(*center, "shield", 20)
+
+    def _update_active_powerups(self):
+        for powerup in list(self.active_powerups):
+            powerup["timer"] -= 1
+
+            # Remove expired power-ups
+            if powerup["timer"] <= 0:
+                self.active_powerups.remove(powerup)
+                if powerup["type"] == "shield":
+                    self.invincibility_timer = 0
+                elif powerup["type"] == "slow_time":
+                    self.current_game_speed = self.normal_game_speed
+
+if __name__ == "__main__":
+    import time
+    import argparse
+    from config import argument_parser, load_config
+
+    # Run simulated frames as fast as possible: python simulation.py [frames] [seed] [--setting value ...]
+    parser = argument_parser(argparse.ArgumentParser(description="Headless simulation benchmark"))
+    parser.add_argument("frames", nargs="?", type=int, default=10000)
+    parser.add_argument("seed", nargs="?", type=int)
+    args = parser.parse_args()
+    frames = args.frames
+    config = load_config(args=args)  # Headless, so any resolution works here
+    world = GameSimulation(seed=args.seed, config=config)
+    runs = [world.seed]
+    start = time.perf_counter()
+    for frame in range(frames):
+        if world.game_over:
+            # Successive runs use consecutive seeds, so a seeded benchmark is repeatable
+            world.close()
+            world = GameSimulation(seed=runs[-1] + 1, config=config)
+            runs.append(world.seed)
+        world.step(FrameInput(frame % 45 == 0, False))
+    elapsed = time.perf_counter() - start
+    print(f"{frames} frames in {elapsed:.2f}s ({frames / elapsed:.0f} frames/s)")
+    print(f"{len(runs)} runs from seed {runs[0]}, last score {world.score}")
@@ -0,0 +1,144 @@
+import pygame
+from constants import *
+from bloom import build_bloom
+from cache import LRUCache
+from quality import quality
+
+# Cached neon text rendering on top of utils.draw_neon_text
+DIGITS = "0123456789-"
+
+def tier_glow_radius(glow_radius):
+    """The glow radius text gets at the active quality tier; 0 once the tier drops glows"""
+    if not ENABLE_BLOOM:
+        return 0
+    return int(round(glow_radius * quality.tier.bloom))
+
+def _glow_padding(glow_radius):
+    # Room for the 2px outline offset and the bloom's 2 * radius footprint
+    if ENABLE_BLOOM and glow_radius > 0:
+        return max(2, glow_radius * 2)
+    return 2
+
+def build_neon_layers(text, font, color, glow_color=(100, 100, 100), glow_radius=3):
+    """Render the layers draw_neon_text produces: (outline + glow, text)"""
+    text_surface = font.render(text, True, color)
+    outline_surface = font.render(text, True, (0, 0, 0))
+
+    pad = _glow_padding(glow_radius)
+    under = pygame.Surface((text_surface.get_width() + pad, text_surface.get_height() + pad), pygame.SRCALPHA)
+    under.blit(outline_surface, (2, 2))
+    if ENABLE_BLOOM and glow_radius > 0:
+        under.blit(build_bloom(text_surface, glow_radius, glow_color, alpha_factor=0.8), (0, 0))
+
+    return under, text_surface
+
+def build_neon_text(text, font, color, glow_color=(100, 100, 100), glow_radius=3):
+    """Flatten outline, glow and text into one surface anchored at the text position"""
+    under, text_surface = build_neon_layers(text, font, color, glow_color, glow_radius)
+    under.blit(text_surface, (0, 0))
+    return under, text_surface.get_size()
+
+class DigitAtlas:
+    """Pre-rendered neon glyphs for digits, so numbers are built from blits"""
+    def __init__(self, font, color, glow_color=(100, 100, 100), glow_radius=3, chars=DIGITS):
+        self.font = font
+        self.glyphs = {}
+        for char in chars:
+            under, text_surface = build_neon_layers(char, font, color, glow_color, glow_radius)
+            self.glyphs[char] = (under, text_surface, font.size(char)[0])
+        self.height = font.get_height()
+        self.padding = _glow_padding(glow_radius)
+
+    def size(self, text):
+        return sum(self.glyphs[char][2] for char in text), self.height
+
+    def compose(self, text, prefix=None):
+        """Build a number (optionally after a pre-rendered prefix) from cached glyphs
+
+        prefix is a (under, text_surface) pair from build_neon_layers. Glow and outline
+        layers go down first so a glyph's glow never covers its neighbour's face.
+        """
+        prefix_width = prefix[1].get_width() if prefix else 0
+        width, height = self.size(text)
+        surface = pygame.Surface((prefix_width + width + self.padding, height + self.padding), pygame.SRCALPHA)
+
+        faces = []
+        if prefix:
+            surface.blit(prefix[0], (0, 0))
+            faces.append((prefix[1], (0, 0)))
+        x = prefix_width
+        for char in text:
+            under, text_surface, advance = self.glyphs[char]
+            surface.blit(under, (x, 0))
+            faces.append((text_surface, (x, 0)))
+            x += advance
+        surface.blits(faces, doreturn=False)
+
+        return surface, (prefix_width + width, height)
+
+class TextRenderer:
+    def __init__(self, maxsize=128):
+        self.cache = LRUCache(maxsize)
+        self.atlases = LRUCache(16)
+        self.prefixes = LRUCache(32)
+
+    def render(self, text, font, color, glow_color=(100, 100, 100), glow_radius=3):
+        """Return (composite, text_size) for the text, rendering it on a cache miss"""
+        glow_radius = tier_glow_radius(glow_radius)  # Part of the key, so each tier caches its own
+        key = (text, font, tuple(color), tuple(glow_color), glow_radius)
+        entry = self.cache.get(key)
+        if entry is None:
+            entry = self.cache.put(key, build_neon_text(text, font, color, glow_color, glow_radius))
+        return entry
+
+    def atlas(self, font, color, glow_color=(100, 100, 100), glow_radius=3):
+        glow_radius = tier_glow_radius(glow_radius)
+        key = (font, tuple(color), tuple(glow_color), glow_radius)
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            atlas = self.atlases.put(key, DigitAtlas(font, color, glow_color, glow_radius))
+        return atlas
+
+    def prefix(self, text, font, color, glow_color=(100, 100, 100), glow_radius=3):
+        glow_radius = tier_glow_radius(glow_radius)
+        key = (text, font, tuple(color), tuple(glow_color), glow_radius)
+        layers = self.prefixes.get(key)
+        if layers is None:
+            layers = self.prefixes.put(key, build_neon_layers(text, font, color, glow_color, glow_radius))
+        return layers
+
+text_renderer = TextRenderer()
+
+def draw_cached_neon_text(surface, text, font, color, position, glow_color=(100, 100, 100), glow_radius=3):
+    """Drop-in replacement for draw_neon_text that blits a cached composite"""
+    composite, size = text_renderer.render(text, font, color, glow_color, glow_radius)
+    surface.blit(composite, position)
+    return size
+
+def blit_cached_neon_text(surface, text, font, color, position, glow_color=(100, 100, 100), glow_radius=3):
+    """As draw_cached_neon_text, but returns the rect it covered, for dirty-rect updates"""
+    composite, _ = text_renderer.render(text, font, color, glow_color, glow_radius)
+    return surface.blit(composite, position)
+
+class NeonCounter:
+    """HUD label such as "Score: 12" that re-renders only when its value changes"""
+    def __init__(self, prefix, font, color, glow_color=(100, 100, 100), glow_radius=3):
+        self.prefix = prefix
+        self.font = font
+        self.color = color
+        self.glow_color = glow_color
+        self.glow_radius = glow_radius
+        self._state = None
+        self._surface = None
+        self._size = (0, 0)
+
+    def draw(self, surface, value, position, color=None):
+        color = color or self.color
+        state = (value, color, quality.level)  # A tier change can change the glow
+        if state != self._state:
+            atlas = text_renderer.atlas(self.font, color, self.glow_color, self.glow_radius)
+            prefix = text_renderer.prefix(self.prefix, self.font, color, self.glow_color, self.glow_radius)
+            self._surface, self._size = atlas.compose(str(value), prefix)
+            self._state = state
+        surface.blit(self._surface, position)
+        return self._size
@@ -4,6 +4,7 @@ import os
 import random
 import math
 from constants import *
+from bloom import bloom_engine
 
 # High score functions
 def load_high_score():
@@ -38,6 +39,54 @@ class ScreenShake:
             return offset_x, offset_y
         return 0, 0
 
+# Convert cached artwork to the display's pixel format for faster blits
+def to_display_format(surface, alpha=True):
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+# Menu screens: a cached static layer plus dirty-rect updates for the animated parts
+class DirtyRectScreen:
+    def __init__(self, display):
+        self.display = display
+        self.screen = display.surface
+        self.layer = None
+        self._previous = []  # Rects the animated elements covered last frame
+        self._dirty = []
+        self._full_update = True
+    
+    def invalidate(self):
+        """Rebuild the static layer on the next begin_frame"""
+        self.layer = None
+    
+    def begin_frame(self, draw_static):
+        """Restore the areas animated last frame; draw_static(surface) paints a new layer when needed"""
+        if self.layer is None:
+            self.layer = pygame.Surface(self.screen.get_size())
+            self.layer = to_display_format(self.layer, alpha=False)
+            draw_static(self.layer)
+            self.screen.blit(self.layer, (0, 0))
+            self._full_update = True
+        else:
+            for rect in self._previous:
+                self.screen.blit(self.layer, rect, rect)
+        self._dirty = []
+    
+    def mark(self, rect):
+        """Record a rect drawn this frame, e.g. the one returned by blit"""
+        if rect:
+            self._dirty.append(pygame.Rect(rect).clip(self.screen.get_rect()))
+        return rect
+    
+    def present(self):
+        """Push only the changed areas to the display: last frame's rects and this frame's"""
+        if self._full_update:
+            self.display.present()
+            self._full_update = False
+        else:
+            self.display.present(self._previous + self._dirty)
+        self._previous = self._dirty
+
 # Utility functions for creating gradients and visual effects
 def create_gradient_rect(width, height, color1, color2, direction=1):
     """Create a vertical or horizontal gradient"""
@@ -59,35 +108,9 @@ def create_gradient_rect(width, height, color1, color2, direction=1):
             pygame.draw.line(surface, (r, g, b), (x, 0), (x, height))
     return surface
 
-def apply_bloom_effect(surface, radius=10, color=(255, 255, 255), alpha_factor=0.5):
-    """Apply a bloom/glow effect to a surface"""
-    # Create a larger surface to accommodate the bloom
-    width, height = surface.get_width() + radius * 2, surface.get_height() + radius * 2
-    bloom = pygame.Surface((width, height), pygame.SRCALPHA)
-    
-    # Scale the surface for the bloom effect
-    scaled = pygame.transform.scale(surface, (surface.get_width() + radius, surface.get_height() + radius))
-    
-    # Set alpha/opacity based on the alpha_factor
-    scaled.set_alpha(int(255 * alpha_factor))
-    
-    # Apply the color tint to the glow
-    for x in range(width):
-        for y in range(height):
-            if x < scaled.get_width() and y < scaled.get_height():
-                pixel = scaled.get_at((x, y))
-                if pixel[3] > 0:  # If pixel is not fully transparent
-                    # Create a colored glow based on the pixel's alpha
-                    alpha = pixel[3] / 255.0 * alpha_factor
-                    bloom_color = (
-                        min(255, int(color[0] * alpha)),
-                        min(255, int(color[1] * alpha)),
-                        min(255, int(color[2] * alpha)),
-                        min(255, int(alpha * 255))
-                    )
-                    bloom.set_at((x + (radius//2), y + (radius//2)), bloom_color)
-    
-    return bloom
+def apply_bloom_effect(surface, radius=10, color=(255, 255, 255), alpha_factor=0.5, cache_key=None):
+    """Apply a bloom/glow effect to a surface (cached, see bloom.py)"""
+    return bloom_engine.bloom(surface, radius, color, alpha_factor, key=cache_key)
 
 def draw_neon_text(surface, text, font, color, position, glow_color=(100, 100, 100), glow_radius=3):
     # Create main text surface with the specified color
@@ -102,7 +125,9 @@ def draw_neon_text(surface, text, font, color, position, glow_color=(100, 100, 1
     # Apply bloom/glow effect if enabled and radius > 0
     if ENABLE_BLOOM and glow_radius > 0:
         # Increase alpha/opacity of glow for better visibility
-        bloom_surface = apply_bloom_effect(text_surface, glow_radius, glow_color, alpha_factor=0.8)
+        # Keyed by text and font so unchanged text reuses its glow every frame
+        bloom_surface = apply_bloom_effect(text_surface, glow_radius, glow_color, alpha_factor=0.8,
+                                           cache_key=(text, font, color))
         surface.blit(bloom_surface, position)
     
     # Draw main text on top
@@ -2,145 +2,25 @@ import pygame
 import random
 import math
 from constants import *
-from utils import create_gradient_rect, apply_bloom_effect
+from utils import to_display_format
+from assets import assets
+from pool import ObjectPool
+from display import get_surface
+from quality import quality
 
-# Initialize stars for the parallax background
-stars = []
-for _ in range(200):
-    x = random.randint(0, WIDTH)
-    y = random.randint(0, HEIGHT - GROUND_HEIGHT)
-    size = random.uniform(0.5, 2.5)
-    stars.append((x, y, size))
-
-# Enhanced particle system
-class EnhancedParticle:
-    def __init__(self, x, y, particle_type="normal"):
-        self.x = x
-        self.y = y
-        self.type = particle_type
-        
-        # Base properties - make particles smaller
-        self.size = random.uniform(1, 4)  # Reduced from 2-6
-        self.color = random.choice(PARTICLE_COLORS)
-        self.alpha = 200  # Reduced from 255
-        
-        # Set behavior based on type - make lifetimes shorter
-        if particle_type == "normal":
-            self.vx = random.uniform(-1.5, 1.5)  # Reduced velocity
-            self.vy = random.uniform(-3, -0.5)
-            self.lifetime = random.randint(15, 30)  # Shorter lifetime
-            self.gravity = 0.1
-            self.decay_rate = 6  # Faster decay
-            
-        elif particle_type == "explode":
-            self.vx = random.uniform(-4, 4)  # Reduced velocity
-            self.vy = random.uniform(-4, 4)
-            self.lifetime = random.randint(20, 40)  # Shorter lifetime
-            self.gravity = 0.05
-            self.size = random.uniform(2, 5)  # Smaller size
-            self.decay_rate = 6  # Faster decay
-            
-        elif particle_type == "trail":
-            self.vx = random.uniform(-0.5, 0.5)  # Reduced velocity
-            self.vy = random.uniform(-0.3, 0.3)
-            self.lifetime = random.randint(8, 15)  # Much shorter lifetime
-            self.gravity = 0
-            self.size = random.uniform(1, 2)  # Smaller size
-            self.decay_rate = 15  # Much faster decay
-            
-        elif particle_type == "land":
-            self.vx = random.uniform(-3, 3)
-            self.vy = random.uniform(-2, 0)
-            self.lifetime = random.randint(15, 30)
-            self.gravity = 0.15
-            self.decay_rate = 8
-            
-        # New particle types for power-ups
-        elif particle_type == "shield":
-            self.vx = random.uniform(-2, 2)
-            self.vy = random.uniform(-2, 2)
-            self.lifetime = random.randint(20, 40)
-            self.gravity = 0
-            self.size = random.uniform(2, 4)
-            self.decay_rate = 6
-            self.color = (50, 150, 255)  # Blue shield particles
-            
-        elif particle_type == "score":
-            self.vx = random.uniform(-3, 3)
-            self.vy = random.uniform(-4, -1)
-            self.lifetime = random.randint(20, 35)
-            self.gravity = 0.05
-            self.size = random.uniform(2, 4)
-            self.decay_rate = 7
-            self.color = (255, 215, 0)  # Gold particles for score
-        
-        # Special properties
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(-5, 5)
-        self.shape = random.choice(["circle", "square", "star"]) if random.random() > 0.7 else "circle"
-    
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += self.gravity
-        self.lifetime -= 1
-        self.alpha = max(0, self.alpha - self.decay_rate)
-        self.size = max(0, self.size - 0.05)
-        self.rotation += self.rotation_speed
-    
-    def draw(self, surface):
-        # Make particles less bright and more transparent
-        if self.alpha < 70:  # Don't even draw nearly-invisible particles
-            return
-            
-        # Create particle surface
-        particle_surf = pygame.Surface((int(self.size * 2), int(self.size * 2)), pygame.SRCALPHA)
-        
-        if self.shape == "circle":
-            pygame.draw.circle(particle_surf, (*self.color, self.alpha), 
-                             (int(self.size), int(self.size)), int(self.size))
-                             
-        elif self.shape == "square":
-            rect = pygame.Rect(0, 0, int(self.size * 2), int(self.size * 2))
-            pygame.draw.rect(particle_surf, (*self.color, self.alpha), rect)
-            
-        elif self.shape == "star":
-            # Simple star shape
-            points = []
-            for i in range(5):
-                # Outer points
-                angle = math.pi * 2 * i / 5 - math.pi / 2
-                points.append((
-                    self.size + math.cos(angle) * self.size,
-                    self.size + math.sin(angle) * self.size
-                ))
-                # Inner points
-                angle += math.pi / 5
-                points.append((
-                    self.size + math.cos(angle) * (self.size / 2),
-                    self.size + math.sin(angle) * (self.size / 2)
-                ))
-            pygame.draw.polygon(particle_surf, (*self.color, self.alpha), points)
-        
-        # Apply rotation if needed
-        if self.rotation != 0 and self.shape != "circle":
-            particle_surf = pygame.transform.rotate(particle_surf, self.rotation)
-        
-        # Add glow for certain particles
-        if ENABLE_BLOOM and (self.type == "explode" or random.random() > 0.7):
-            glow_size = int(self.size * 3)
-            glow_surf = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surf, (*self.color, min(100, self.alpha // 2)), 
-                             (glow_size, glow_size), glow_size)
-            
-            # Position for glow (centered)
-            glow_pos = (int(self.x - glow_size), int(self.y - glow_size))
-            surface.blit(glow_surf, glow_pos, special_flags=pygame.BLEND_ADD)
-        
-        # Position for particle (centered)
-        pos = (int(self.x - particle_surf.get_width() // 2), 
-               int(self.y - particle_surf.get_height() // 2))
-        surface.blit(particle_surf, pos)
+def create_star_layer(width, height, count, max_size, brightness_range):
+    """Create a horizontally tileable layer of stars on black for parallax scrolling"""
+    layer = pygame.Surface((width, height))
+    layer.fill((0, 0, 0))
+    for _ in range(count):
+        x = random.randint(0, width)
+        y = random.randint(0, height - GROUND_HEIGHT)
+        size = random.random() * max_size
+        brightness = random.randint(*brightness_range)
+        # Draw stars near an edge a second time on the other side so the tile wraps
+        for wrap_x in (x - width, x, x + width):
+            pygame.draw.circle(layer, (brightness, brightness, brightness), (wrap_x, y), size)
+    return layer
 
 # Create starry background with parallax layers
 def create_starry_background(width, height, stars=200):
@@ -203,32 +83,22 @@ def create_starry_background(width, height, stars=200):
             pygame.draw.circle(s, color, (radius, radius), radius)
             main_bg.blit(s, (center_x + offset_x - radius, center_y + offset_y - radius))
     
+    # Both star layers are always made (and cached); draw_parallax_background decides
+    # how many are shown from the config and quality tier
     # Add distant stars layer (moves slower in parallax)
-    if ENABLE_PARALLAX:
-        distant_stars = pygame.Surface((width * 2, height), pygame.SRCALPHA)
-        for _ in range(100):
-            x = random.randint(0, width * 2)
-            y = random.randint(0, height - GROUND_HEIGHT)
-            size = random.random() * 1.5
-            brightness = random.randint(150, 220)
-            pygame.draw.circle(distant_stars, (brightness, brightness, brightness), (x, y), size)
-        bg_layers.append(distant_stars)
+    bg_layers.append(create_star_layer(width * 2, height, 100, 1.5, (150, 220)))
     
-        # Add closer stars layer (moves faster in parallax)
-        close_stars = pygame.Surface((width * 2, height), pygame.SRCALPHA)
-        for _ in range(50):
-            x = random.randint(0, width * 2)
-            y = random.randint(0, height - GROUND_HEIGHT)
-            size = random.random() * 2.0
-            brightness = random.randint(200, 255)
-            pygame.draw.circle(close_stars, (brightness, brightness, brightness), (x, y), size)
-        bg_layers.append(close_stars)
+    # Add closer stars layer (moves faster in parallax)
+    bg_layers.append(create_star_layer(width * 2, height, 50, 2.0, (200, 255)))
     
     return main_bg, bg_layers
 
 # Create enhanced ground texture
 def create_enhanced_ground():
-    ground = pygame.Surface((WIDTH, GROUND_HEIGHT))
+    """Create a horizontally tileable ground strip at least as wide as the screen"""
+    # Texture lines repeat every 20px, so a multiple of 20 tiles seamlessly
+    tile_width = -(-WIDTH // 20) * 20
+    ground = pygame.Surface((tile_width, GROUND_HEIGHT))
     
     # Base gradient
     for y in range(GROUND_HEIGHT):
@@ -236,23 +106,16 @@ def create_enhanced_ground():
         r = int(40 * (1-ratio) + 30 * ratio)
         g = int(210 * (1-ratio) + 120 * ratio)
         b = int(40 * (1-ratio) + 30 * ratio)
-        pygame.draw.line(ground, (r, g, b), (0, y), (WIDTH, y))
+        pygame.draw.line(ground, (r, g, b), (0, y), (tile_width, y))
     
     # Add texture lines
-    for i in range(0, WIDTH, 20):
+    for i in range(0, tile_width, 20):
         darkness = random.randint(0, 30)
         pygame.draw.line(ground, (30-darkness, 180-darkness, 30-darkness), 
                        (i, 0), (i, GROUND_HEIGHT), random.randint(1, 3))
     
     # Add highlight at top
-    pygame.draw.line(ground, (100, 255, 100, 180), (0, 0), (WIDTH, 0), 2)
-    
-    # Add some random grassy tufts
-    for i in range(0, WIDTH, random.randint(30, 80)):
-        height = random.randint(5, 15)
-        width = random.randint(3, 8)
-        pygame.draw.polygon(ground, (30, 180, 30), 
-                          [(i, 0), (i+width//2, -height), (i+width, 0)])
+    pygame.draw.line(ground, (100, 255, 100, 180), (0, 0), (tile_width, 0), 2)
     
     return ground
 
@@ -304,66 +167,97 @@ def create_player_image():
     
     return img, glow_surface
 
-# Initialize background, ground, and player images
-background, bg_layers = create_starry_background(WIDTH, HEIGHT)
-ground_surface = create_enhanced_ground()
-player_img, player_glow = create_player_image()
-
-# Draw functions
-def draw_parallax_background(offset):
-    # Draw starry background
-    screen.fill(BG_COLOR)
+def bake_background(width, height):
+    """Starfield base with the depth gradient baked in, followed by the parallax star layers"""
+    base, layers = create_starry_background(width, height)
     
-    # Draw stars with parallax effect
-    for i, star in enumerate(stars):
-        # Calculate parallax offset based on layer
-        layer_offset = (offset * (i % 3 + 1) / 5) % WIDTH
-        
-        # Draw stars with different brightness based on layer
-        alpha = 100 + 50 * (i % 3)
-        pygame.draw.circle(
-            screen, 
-            (255, 255, 255, alpha), 
-            ((star[0] - layer_offset) % WIDTH, star[1]), 
-            star[2]
-        )
+    gradient = pygame.Surface(base.get_size(), pygame.SRCALPHA)
+    for y in range(height):
+        alpha = int(y / height * 50)  # Gradually increase transparency
+        pygame.draw.line(gradient, (0, 0, 30, alpha), (0, y), (width, y))
+    base.blit(gradient, (0, 0))
     
-    # Draw a subtle gradient overlay for depth
-    gradient = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    for y in range(HEIGHT):
-        alpha = int(y / HEIGHT * 50)  # Gradually increase transparency
-        pygame.draw.line(gradient, (0, 0, 30, alpha), (0, y), (WIDTH, y))
-    screen.blit(gradient, (0, 0))
+    return [base] + layers
 
-def draw_ground():
-    # Draw the ground
-    ground_surface = pygame.Surface((WIDTH, GROUND_HEIGHT))
-    ground_surface.fill(GROUND_COLOR)
-    
-    # Add grid lines
-    for x in range(0, WIDTH, 40):
-        pygame.draw.line(ground_surface, (30, 180, 30), (x, 0), (x, GROUND_HEIGHT), 2)
-    for y in range(0, GROUND_HEIGHT, 20):
-        pygame.draw.line(ground_surface, (30, 180, 30), (0, y), (WIDTH, y), 2)
+class BackgroundRenderer:
+    """Pre-baked background: one opaque base blit plus at most two blits per star layer"""
+    def __init__(self, base, layers, speeds=(0.2, 0.5)):
+        self.width = base.get_width()
+        self.base = to_display_format(base, alpha=False)
+        
+        self.layers = []
+        for layer, speed in zip(layers, speeds):
+            # Opaque layer with a colorkey blits much faster than per-pixel alpha
+            layer = to_display_format(layer, alpha=False)
+            layer.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+            self.layers.append((layer, speed))
     
-    screen.blit(ground_surface, (0, HEIGHT - GROUND_HEIGHT))
+    def draw(self, surface, offset, layers=None):
+        surface.blit(self.base, (0, 0))
+        
+        # Each tile wraps around, so one or two blits cover the screen at any offset
+        for layer, speed in self.layers[:layers]:
+            tile_width = layer.get_width()
+            x = -int(offset * speed % tile_width)
+            surface.blit(layer, (x, 0))
+            if x + tile_width < self.width:
+                surface.blit(layer, (x + tile_width, 0))
+
+# Background, ground and player images are generated the first time they're drawn
+# The raw surfaces go through the on-disk asset cache, so later starts just load them
+assets.register("background", lambda base, *layers: BackgroundRenderer(base, layers),
+                bake=lambda: bake_background(WIDTH, HEIGHT), version=2)  # v1 could be baked without star layers
+assets.register("ground", lambda ground: to_display_format(ground, alpha=False),
+                bake=create_enhanced_ground)
+assets.register("player", lambda img, glow: (to_display_format(img), to_display_format(glow)),
+                bake=create_player_image)
+
+def player_images():
+    """(image, glow) surfaces for the player"""
+    return assets.get("player")
+
+# Draw functions - they draw to the game surface unless given another one, with the
+# process config unless given another one
+def draw_parallax_background(offset, surface=None, config=None):
+    layers = quality.tier.parallax_layers if (config or CONFIG).enable_parallax else 0
+    assets.get("background").draw(surface or get_surface(), offset, layers)
+
+def draw_ground(offset=0, surface=None, config=None):
+    # Scroll the pre-rendered strip; two blits cover the screen at any offset
+    metrics = (config or CONFIG).metrics
+    surface = surface or get_surface()
+    ground_surface = assets.get("ground")
+    tile_width = ground_surface.get_width()
+    x = -int(offset % tile_width)
+    ground_y = metrics.height - metrics.ground_height
+    surface.blit(ground_surface, (x, ground_y))
+    if x + tile_width < metrics.width:
+        surface.blit(ground_surface, (x + tile_width, ground_y))
 
 # Add PowerUp class
 class PowerUp:
-    def __init__(self, x, y, power_type):
+    # Different colors for different power-ups
+    colors = {
+        "extra_life": (255, 50, 50),    # Red for extra life
+        "shield": (50, 100, 255),       # Blue for shield
+        "score_boost": (255, 215, 0),   # Gold for score boost
+        "slow_time": (180, 180, 255)    # Light blue for slow time
+    }
+    
+    def __init__(self, x, y, power_type, config=None):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, power_type, config)
+    
+    def reset(self, x, y, power_type, config=None):
+        """(Re)initialise as a new power-up; pooled power-ups are reused through this"""
+        self.config = config or CONFIG
         self.x = x
+        self.prev_x = x  # Position before the last update, for render interpolation
         self.y = y
         self.type = power_type
         self.size = 30
-        self.rect = pygame.Rect(x, y, self.size, self.size)
-        
-        # Different colors for different power-ups
-        self.colors = {
-            "extra_life": (255, 50, 50),    # Red for extra life
-            "shield": (50, 100, 255),       # Blue for shield
-            "score_boost": (255, 215, 0),   # Gold for score boost
-            "slow_time": (180, 180, 255)    # Light blue for slow time
-        }
+        self.rect.topleft = (x, y)
+        self.rect.size = (self.size, self.size)
         
         self.color = self.colors.get(power_type, (255, 255, 255))
         self.pulse_dir = 1
@@ -371,8 +265,9 @@ class PowerUp:
         self.rotation = 0
         
     def update(self, speed=None):
-        # Use provided speed if available, otherwise use constant
-        move_speed = speed if speed is not None else GAME_SPEED
+        # Use provided speed if available, otherwise the configured one
+        move_speed = speed if speed is not None else self.config.metrics.game_speed
+        self.prev_x = self.x
         self.x -= move_speed
         self.rect.x = self.x
         
@@ -383,7 +278,9 @@ class PowerUp:
             
         self.rotation = (self.rotation + 3) % 360
         
-    def draw(self, surface):
+    def draw(self, surface, alpha=1.0):
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        
         # Create power-up surface
         power_surf = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
         
@@ -430,21 +327,25 @@ class PowerUp:
                            (self.size//2, self.size//2), 
                            (self.size*3//4, self.size//2), 2)
         
-        # Add glow effect
-        glow_size = int(self.size * (1.0 + 0.3 * self.pulse))
-        glow_surf = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
-        
-        # Draw glow
-        alpha = int(100 * (0.5 + 0.5 * self.pulse))
-        glow_color = (*self.color, alpha)
-        pygame.draw.circle(glow_surf, glow_color, 
-                         (glow_size//2, glow_size//2), glow_size//2)
-        
-        # Draw glow with offset for the pulsing effect
-        glow_offset = (self.size - glow_size) // 2
-        surface.blit(glow_surf, (self.x + glow_offset, self.y + glow_offset))
+        # Add glow effect, unless the quality tier has turned glows off
+        if self.config.enable_bloom and quality.tier.bloom > 0:
+            glow_size = int(self.size * (1.0 + 0.3 * self.pulse))
+            glow_surf = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
+            
+            # Draw glow
+            alpha = int(100 * (0.5 + 0.5 * self.pulse))
+            glow_color = (*self.color, alpha)
+            pygame.draw.circle(glow_surf, glow_color, 
+                             (glow_size//2, glow_size//2), glow_size//2)
+            
+            # Draw glow with offset for the pulsing effect
+            glow_offset = (self.size - glow_size) // 2
+            surface.blit(glow_surf, (x + glow_offset, self.y + glow_offset))
         
         # Apply rotation and draw the power-up
         rotated = pygame.transform.rotate(power_surf, self.rotation)
-        rotated_rect = rotated.get_rect(center=(self.x + self.size//2, self.y + self.size//2))
-        surface.blit(rotated, rotated_rect) 
\ No newline at end of file
+        rotated_rect = rotated.get_rect(center=(x + self.size//2, self.y + self.size//2))
+        surface.blit(rotated, rotated_rect)
+
+# Collected and off-screen power-ups are recycled for new spawns
+power_up_pool = ObjectPool(PowerUp, maxsize=8)